@@ -0,0 +1,84 @@
+"""Запускает тесты проекта на SQLite и PostgreSQL.
+
+Для PostgreSQL используется сервер из переменных DB_HOST/DB_PORT,
+а если они не заданы — временный кластер, который скрипт поднимает
+через initdb/pg_ctl и удаляет после тестов. Если PostgreSQL недоступен,
+прогон на нем пропускается.
+
+    python scripts/run_tests.py [--engine sqlite|postgresql|all]
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from contextlib import contextmanager
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROJECT_DIR = os.path.join(ROOT_DIR, 'yatube')
+TEST_PORT = '54329'
+
+
+@contextmanager
+def local_postgres():
+    """Поднимает временный кластер PostgreSQL и возвращает его окружение."""
+    if os.getenv('DB_HOST'):
+        yield {}
+        return
+    if not (shutil.which('initdb') and shutil.which('pg_ctl')):
+        yield None
+        return
+    data_dir = tempfile.mkdtemp(prefix='yatube-pg-')
+    subprocess.run(['initdb', '-D', data_dir, '-U', 'yatube',
+                    '--auth=trust'], check=True, stdout=subprocess.DEVNULL)
+    subprocess.run(['pg_ctl', '-D', data_dir, '-w', '-l',
+                    os.path.join(data_dir, 'server.log'), '-o',
+                    f"-p {TEST_PORT} -k {data_dir} -c listen_addresses=''",
+                    'start'], check=True, stdout=subprocess.DEVNULL)
+    try:
+        yield {'DB_HOST': data_dir, 'DB_PORT': TEST_PORT,
+               'POSTGRES_USER': 'yatube', 'POSTGRES_DB': 'postgres'}
+    finally:
+        subprocess.run(['pg_ctl', '-D', data_dir, '-m', 'fast', 'stop'],
+                       stdout=subprocess.DEVNULL)
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def run_suites(extra_env):
+    """Запускает pytest и тесты приложений, возвращает код возврата."""
+    env = {**os.environ, **extra_env}
+    commands = [
+        ([sys.executable, '-m', 'pytest'], ROOT_DIR),
+        ([sys.executable, 'manage.py', 'test'], PROJECT_DIR),
+    ]
+    code = 0
+    for command, cwd in commands:
+        code = subprocess.run(command, cwd=cwd, env=env).returncode or code
+    return code
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--engine', default='all',
+                        choices=('sqlite', 'postgresql', 'all'))
+    engine = parser.parse_args().engine
+
+    code = 0
+    if engine in ('sqlite', 'all'):
+        print('== SQLite')
+        code = run_suites({'DB_ENGINE': 'sqlite'}) or code
+    if engine in ('postgresql', 'all'):
+        with local_postgres() as postgres_env:
+            if postgres_env is None:
+                print('== PostgreSQL недоступен, прогон пропущен')
+            else:
+                print('== PostgreSQL')
+                code = run_suites(
+                    {'DB_ENGINE': 'postgresql', **postgres_env}) or code
+    return code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,48 @@
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.test import Client
+from django.urls import reverse
+
+from core.benchmark import (benchmark_database, format_stats, measure,
+                            seed_content)
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает время ответа и число SQL-запросов JSON API '
+            'и HTML-страниц с теми же постами.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=100)
+
+    def handle(self, *args, **options):
+        with benchmark_database():
+            user, group, post = seed_content()
+            client = Client()
+            client.force_login(user)
+            pairs = {
+                'index': (
+                    reverse('posts:index'),
+                    reverse('api:post_list')),
+                'group': (
+                    reverse('posts:group_list', kwargs={'slug': group.slug}),
+                    reverse('api:group_posts', kwargs={'slug': group.slug})),
+                'profile': (
+                    reverse('posts:profile',
+                            kwargs={'username': post.author}),
+                    reverse('api:profile_posts',
+                            kwargs={'username': post.author})),
+                'post_detail': (
+                    reverse('posts:post_detail', kwargs={'post_id': post.id}),
+                    reverse('api:post_detail', kwargs={'post_id': post.id})),
+                'follow': (
+                    reverse('posts:follow_index'),
+                    reverse('api:follow_feed')),
+            }
+            for name, addresses in pairs.items():
+                for kind, address in zip(('html', 'api'), addresses):
+                    def request():
+                        cache.clear()
+                        client.get(address)
+
+                    stats = measure(request, options['requests'])
+                    self.stdout.write(format_stats(f'{name} {kind}', stats))
@@ -0,0 +1,104 @@
+"""Сериализация постов и комментариев через values().
+
+Поля ответа описаны словарями «имя в API → путь в ORM»: values()
+получает связанные поля join-ами в том же запросе, и в ответ попадают
+готовые словари без создания объектов моделей.
+"""
+
+import base64
+from heapq import merge
+from itertools import islice
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+POST_FIELDS = {
+    'id': 'id',
+    'text': 'text',
+    'pub_date': 'pub_date',
+    'author': 'author__username',
+    'group': 'group__slug',
+    'image': 'image',
+}
+
+COMMENT_FIELDS = {
+    'id': 'id',
+    'text': 'text',
+    'created': 'created',
+    'author': 'author__username',
+}
+
+#  поля, по которым строится курсор, выбираются всегда
+CURSOR_FIELDS = ('pub_date', 'id')
+
+
+class InvalidParameter(ValueError):
+    """Неверный параметр запроса, отдается клиенту как ошибка 400."""
+
+
+def select_fields(requested, available):
+    """Поля из параметра fields или все доступные поля."""
+    if not requested:
+        return list(available)
+    fields = [name for name in requested.split(',') if name]
+    unknown = set(fields) - set(available)
+    if unknown:
+        raise InvalidParameter(
+            f'Неизвестные поля: {", ".join(sorted(unknown))}.')
+    return fields
+
+
+def serialize(rows, fields, available):
+    """Переименовывает ключи values() в имена полей API."""
+    for row in rows:
+        item = {name: row[available[name]] for name in fields}
+        if item.get('image'):
+            item['image'] = settings.MEDIA_URL + item['image']
+        yield item
+
+
+def encode_cursor(row):
+    value = f'{row["pub_date"].isoformat()}|{row["id"]}'
+    return base64.urlsafe_b64encode(value.encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        pub_date, pk = base64.urlsafe_b64decode(
+            cursor.encode()).decode().split('|')
+        pub_date = parse_datetime(pub_date)
+        pk = int(pk)
+    except ValueError:
+        pub_date = None
+    if pub_date is None:
+        raise InvalidParameter('Неверный курсор.')
+    return pub_date, pk
+
+
+def cursor_page(querysets, fields, cursor, limit):
+    """Страница постов после курсора по убыванию (pub_date, id).
+
+    Каждый запрос читает не больше limit + 1 строк по индексу
+    (pub_date, id), результаты сливаются, как в HybridFeed.
+    Возвращает словари полей и курсор следующей страницы или None.
+    """
+    lookups = {POST_FIELDS[name] for name in fields} | set(CURSOR_FIELDS)
+    condition = Q()
+    if cursor:
+        pub_date, pk = decode_cursor(cursor)
+        condition = Q(pub_date__lt=pub_date) | Q(pub_date=pub_date,
+                                                 id__lt=pk)
+    sources = [
+        queryset.filter(condition).order_by('-pub_date', '-id')
+        .values(*lookups)[:limit + 1]
+        for queryset in querysets
+    ]
+    rows = list(islice(
+        merge(*sources, key=lambda row: (row['pub_date'], row['id']),
+              reverse=True),
+        limit + 1))
+    next_cursor = None
+    if len(rows) > limit:
+        next_cursor = encode_cursor(rows[limit - 1])
+    return list(serialize(rows[:limit], fields, POST_FIELDS)), next_cursor
@@ -0,0 +1,106 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Comment, Follow, Group, Post
+
+User = get_user_model()
+
+POSTS_COUNT = 15
+
+
+class ApiTest(TestCase):
+    """Тестируем JSON API постов."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='Marina')
+        cls.author = User.objects.create_user(username='Irina')
+        cls.group = Group.objects.create(title='Тестовая группа',
+                                         slug='test-slug',
+                                         description='Описание')
+        cls.posts = [
+            Post.objects.create(author=cls.author, group=cls.group,
+                                text=f'Тестовый пост {number}')
+            for number in range(POSTS_COUNT)
+        ]
+        cls.post = cls.posts[-1]
+        Comment.objects.create(post=cls.post, author=cls.user,
+                               text='Комментарий')
+
+    def setUp(self):
+        cache.clear()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def collect(self, address):
+        """Проходит все страницы по ссылкам next и собирает id постов."""
+        ids = []
+        while address:
+            data = self.client.get(address).json()
+            ids += [post['id'] for post in data['results']]
+            address = data['next']
+        return ids
+
+    def test_cursor_pagination_walks_all_posts_in_order(self):
+        """Курсор отдает все посты по убыванию даты без повторов."""
+        expected = [post.id for post in reversed(self.posts)]
+        addresses = [
+            reverse('api:post_list') + '?limit=4',
+            reverse('api:group_posts', kwargs={'slug': 'test-slug'}),
+            reverse('api:profile_posts', kwargs={'username': 'Irina'}),
+        ]
+        for address in addresses:
+            with self.subTest(address=address):
+                self.assertEqual(self.collect(address), expected)
+
+    def test_fields_selects_response_keys(self):
+        """Параметр fields ограничивает поля, неизвестное поле — 400."""
+        response = self.client.get(reverse('api:post_list'),
+                                   {'fields': 'id,author', 'limit': 1})
+
+        self.assertEqual(response.json()['results'],
+                         [{'id': self.post.id, 'author': 'Irina'}])
+
+        response = self.client.get(reverse('api:post_list'),
+                                   {'fields': 'id,password'})
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_post_detail_includes_comments(self):
+        """Пост отдается с комментариями, несуществующий — 404."""
+        response = self.client.get(
+            reverse('api:post_detail', kwargs={'post_id': self.post.id}))
+        data = response.json()
+
+        self.assertEqual(data['text'], self.post.text)
+        self.assertEqual(data['group'], 'test-slug')
+        self.assertEqual(
+            [(comment['author'], comment['text'])
+             for comment in data['comments']],
+            [('Marina', 'Комментарий')])
+
+        response = self.client.get(
+            reverse('api:post_detail', kwargs={'post_id': 0}))
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response['Content-Type'], 'application/json')
+
+    def test_follow_feed(self):
+        """Лента подписок доступна только пользователю."""
+        address = reverse('api:follow_feed')
+
+        self.assertEqual(self.client.get(address).status_code, 401)
+
+        Follow.objects.create(user=self.user, author=self.author)
+        data = self.authorized_client.get(address, {'limit': 20}).json()
+
+        self.assertEqual([post['id'] for post in data['results']],
+                         [post.id for post in reversed(self.posts)])
+
+    def test_list_uses_one_query(self):
+        """Страница постов с автором и группой читается одним запросом."""
+        with self.assertNumQueries(1):
+            self.client.get(reverse('api:post_list'))
@@ -0,0 +1,112 @@
+from functools import wraps
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import Http404, JsonResponse
+
+from core.cache import edge_cache
+from posts.feed import HybridFeed, get_follow_feed
+from posts.groups import get_group
+from posts.models import Comment, Post, User
+from posts.utils import POSTS_PER_PAGE
+
+from .serializers import (COMMENT_FIELDS, POST_FIELDS, InvalidParameter,
+                          cursor_page, select_fields, serialize)
+
+
+def json_response(data, status=200):
+    return JsonResponse(data, status=status, encoder=DjangoJSONEncoder,
+                        json_dumps_params={'ensure_ascii': False})
+
+
+def api_view(view):
+    """Отвечает только на GET, ошибки отдает в JSON, а не страницей."""
+    @wraps(view)
+    def inner(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return json_response({'detail': 'Метод не разрешен.'}, 405)
+        try:
+            return view(request, *args, **kwargs)
+        except InvalidParameter as error:
+            return json_response({'detail': str(error)}, 400)
+        except Http404:
+            return json_response({'detail': 'Не найдено.'}, 404)
+    return inner
+
+
+def get_limit(request):
+    try:
+        limit = int(request.GET.get('limit', POSTS_PER_PAGE))
+    except ValueError:
+        raise InvalidParameter('limit должен быть числом.')
+    return max(1, min(limit, settings.API_MAX_LIMIT))
+
+
+def paginated_posts(request, querysets):
+    """Ответ со страницей постов и ссылкой на следующую страницу."""
+    fields = select_fields(request.GET.get('fields'), POST_FIELDS)
+    results, cursor = cursor_page(querysets, fields,
+                                  request.GET.get('cursor'),
+                                  get_limit(request))
+    next_url = None
+    if cursor:
+        params = request.GET.copy()
+        params['cursor'] = cursor
+        next_url = f'{request.path}?{params.urlencode()}'
+    return json_response({'results': results, 'next': next_url})
+
+
+@edge_cache
+@api_view
+def post_list(request):
+    """Все посты, как на главной странице."""
+    return paginated_posts(request, [Post.objects.all()])
+
+
+@edge_cache
+@api_view
+def group_posts(request, slug):
+    """Посты группы."""
+    group = get_group(slug)
+    if group is None:
+        raise Http404
+    return paginated_posts(request, [group.posts.all()])
+
+
+@edge_cache
+@api_view
+def profile_posts(request, username):
+    """Посты автора."""
+    author = User.objects.filter(username=username).values('pk').first()
+    if author is None:
+        raise Http404
+    return paginated_posts(request,
+                           [Post.objects.filter(author_id=author['pk'])])
+
+
+@api_view
+def follow_feed(request):
+    """Лента подписок текущего пользователя."""
+    if not request.user.is_authenticated:
+        return json_response({'detail': 'Нужна авторизация.'}, 401)
+    feed = get_follow_feed(request.user)
+    if isinstance(feed, HybridFeed):
+        return paginated_posts(request, feed.sources())
+    return paginated_posts(request, [feed])
+
+
+@edge_cache
+@api_view
+def post_detail(request, post_id):
+    """Пост с комментариями."""
+    fields = select_fields(request.GET.get('fields'), POST_FIELDS)
+    rows = Post.objects.filter(pk=post_id).values(
+        *{POST_FIELDS[name] for name in fields})
+    post = next(serialize(rows, fields, POST_FIELDS), None)
+    if post is None:
+        raise Http404
+    comments = Comment.objects.filter(post_id=post_id).values(
+        *COMMENT_FIELDS.values())
+    post['comments'] = list(serialize(comments, COMMENT_FIELDS,
+                                      COMMENT_FIELDS))
+    return json_response(post)
@@ -1,5 +1,12 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+
+from .sqlite import configure_sqlite
 
 
 class CoreConfig(AppConfig):
     name = 'core'
+
+    def ready(self):
+        connection_created.connect(configure_sqlite,
+                                   dispatch_uid='core.configure_sqlite')
@@ -0,0 +1,93 @@
+import statistics
+import time
+from contextlib import contextmanager
+
+from django.contrib.auth import get_user_model
+from django.db import connection, connections
+from django.test.utils import CaptureQueriesContext
+
+from posts.models import Comment, Follow, Group, Post
+from tasks.worker import run_batch
+
+User = get_user_model()
+
+WARMUP_REQUESTS = 5
+
+AUTHORS = 5
+POSTS_PER_AUTHOR = 20
+COMMENTS_PER_POST = 3
+
+
+@contextmanager
+def benchmark_database(test_name=None):
+    """Создает временную тестовую БД на время замера и удаляет ее после.
+
+    test_name задает файл тестовой БД для SQLite, если замеру нужен
+    не in-memory вариант, например для нескольких потоков.
+    """
+    old_name = connection.settings_dict['NAME']
+    old_test_name = connection.settings_dict['TEST']['NAME']
+    if test_name:
+        connection.settings_dict['TEST']['NAME'] = test_name
+    connection.creation.create_test_db(verbosity=0, autoclobber=True,
+                                       serialize=False)
+    try:
+        yield
+    finally:
+        connections.close_all()
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        connection.settings_dict['TEST']['NAME'] = old_test_name
+
+
+def measure(func, requests):
+    """Вызывает func requests раз и возвращает статистику времени.
+
+    Время указывается в миллисекундах, queries — число SQL-запросов
+    на один вызов.
+    """
+    for _ in range(WARMUP_REQUESTS):
+        func()
+    timings = []
+    with CaptureQueriesContext(connection) as queries:
+        for _ in range(requests):
+            started = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return {
+        'mean': statistics.mean(timings),
+        'p95': timings[int(len(timings) * 0.95) - 1],
+        'rps': 1000 / statistics.mean(timings),
+        'queries': len(queries) / requests,
+    }
+
+
+def format_stats(label, stats):
+    """Форматирует строку отчета для вывода в консоль."""
+    return (f'{label:<20} mean {stats["mean"]:8.2f} ms  '
+            f'p95 {stats["p95"]:8.2f} ms  {stats["rps"]:8.1f} req/s  '
+            f'{stats["queries"]:5.1f} queries/req')
+
+
+def seed_content():
+    """Заполняет БД замера авторами, постами и комментариями
+    и выполняет поставленные при этом фоновые задачи.
+
+    Возвращает читателя, подписанного на всех авторов, группу
+    и последний созданный пост.
+    """
+    user = User.objects.create_user(username='reader')
+    group = Group.objects.create(title='Группа', slug='group',
+                                 description='Описание')
+    for number in range(AUTHORS):
+        author = User.objects.create_user(username=f'author{number}')
+        Follow.objects.create(user=user, author=author)
+        for _ in range(POSTS_PER_AUTHOR):
+            post = Post.objects.create(author=author, group=group,
+                                       text='Текст поста')
+            for _ in range(COMMENTS_PER_POST):
+                Comment.objects.create(post=post, author=user,
+                                       text='Комментарий')
+    while run_batch(100):
+        pass
+    return user, group, post
@@ -0,0 +1,159 @@
+import hashlib
+import math
+import random
+import threading
+import time
+import uuid
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.filebased import FileBasedCache
+
+#  блокировки пересчета процесса для кешей без атомарного add
+_local_locks = {}
+_local_guard = threading.Lock()
+
+
+def edge_cache(view):
+    """Помечает страницу как кешируемую на обратном прокси.
+
+    Заголовки Cache-Control и Vary ставит core.middleware.EdgeCacheMiddleware,
+    когда уже известно, анонимный ли посетитель и не ставятся ли cookie.
+    """
+    @wraps(view)
+    def inner(request, *args, **kwargs):
+        response = view(request, *args, **kwargs)
+        response.edge_cacheable = True
+        return response
+    return inner
+
+
+def page_cache_key(prefix, request):
+    """Ключ страницы: адрес с параметрами, текущий пользователь и ETag,
+    если его уже посчитал conditional_page. С ETag в ключе измененная
+    страница сразу получает новую запись, а не старую с новым ETag.
+    """
+    viewer = (request.user.pk if request.user.is_authenticated
+              else 'anonymous')
+    path = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    etag = getattr(request, 'page_etag', '')
+    return f'swr:{prefix}:{viewer}:{path}:{etag}'
+
+
+def is_expired(entry, beta):
+    """Вероятностное досрочное истечение (XFetch): чем дольше считалась
+    страница и чем ближе срок, тем вероятнее пересчет до него, поэтому
+    запись обычно обновляется раньше, чем протухает у всех сразу.
+    """
+    early = entry['delta'] * beta * -math.log(1 - random.random())
+    return time.time() + early >= entry['expires']
+
+
+def has_atomic_add():
+    """Атомарен ли cache.add между процессами. У FileBasedCache это
+    проверка файла и запись по отдельности, ее могут пройти все сразу.
+    """
+    return not isinstance(caches['default'], FileBasedCache)
+
+
+def acquire_lock(lock_key):
+    """Берет блокировку пересчета, возвращает ее токен или None.
+
+    Без атомарного add блокировка держится в памяти процесса: тогда
+    страницу пересчитывает не один запрос на узел, а один на процесс.
+    """
+    token = uuid.uuid4().hex
+    if not has_atomic_add():
+        now = time.time()
+        with _local_guard:
+            held = _local_locks.get(lock_key)
+            if held is not None and held[1] > now:
+                return None
+            _local_locks[lock_key] = (
+                token, now + settings.PAGE_CACHE_LOCK_SECONDS)
+        return token
+    if cache.add(lock_key, token, settings.PAGE_CACHE_LOCK_SECONDS):
+        return token
+    return None
+
+
+def release_lock(lock_key, token):
+    """Снимает блокировку, только если она все еще наша: после истечения
+    срока ее мог взять другой запрос.
+    """
+    if not has_atomic_add():
+        with _local_guard:
+            if _local_locks.get(lock_key, (None,))[0] == token:
+                del _local_locks[lock_key]
+        return
+    if cache.get(lock_key) == token:
+        cache.delete(lock_key)
+
+
+def wait_for_lock(key, lock_key, entry):
+    """Ждет блокировку пересчета страницы.
+
+    Возвращает (токен, None), если блокировка взята, (None, запись),
+    если вместо пересчета можно отдать запись, и (None, None), если
+    запись не появилась за PAGE_CACHE_LOCK_SECONDS.
+    """
+    deadline = time.time() + settings.PAGE_CACHE_LOCK_SECONDS
+    while True:
+        token = acquire_lock(lock_key)
+        if token is not None:
+            return token, None
+        if entry is None and time.time() < deadline:
+            time.sleep(0.01)
+            entry = cache.get(key)
+        if entry is not None:
+            return None, entry
+        if time.time() >= deadline:
+            return None, None
+
+
+def render_to_cache(key, timeout, view, request, *args, **kwargs):
+    """Считает страницу и сохраняет успешный ответ без cookie."""
+    started = time.time()
+    response = view(request, *args, **kwargs)
+    if response.status_code == 200 and not response.cookies:
+        cache.set(key, {
+            'response': response,
+            'expires': time.time() + timeout,
+            'delta': time.time() - started,
+        }, timeout + settings.PAGE_CACHE_STALE_SECONDS)
+    return response
+
+
+def stale_while_revalidate(timeout, key_prefix):
+    """Кеширует страницу на timeout секунд с защитой от «набега».
+
+    Замена cache_page: после срока запись еще PAGE_CACHE_STALE_SECONDS
+    хранится устаревшей. Пересчитывает ее один запрос, взявший
+    блокировку (см. acquire_lock), остальные в это время получают старую
+    версию. Если записи нет совсем, остальные ждут пересчета
+    до PAGE_CACHE_LOCK_SECONDS.
+    """
+    def decorator(view):
+        @wraps(view)
+        def inner(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view(request, *args, **kwargs)
+            key = page_cache_key(key_prefix, request)
+            lock_key = key + ':lock'
+            entry = cache.get(key)
+            if entry is not None and not is_expired(
+                    entry, settings.PAGE_CACHE_BETA):
+                return entry['response']
+            token, entry = wait_for_lock(key, lock_key, entry)
+            if entry is not None:
+                return entry['response']
+            if token is None:
+                return view(request, *args, **kwargs)
+            try:
+                return render_to_cache(key, timeout, view, request,
+                                       *args, **kwargs)
+            finally:
+                release_lock(lock_key, token)
+        return inner
+    return decorator
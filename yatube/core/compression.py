@@ -0,0 +1,26 @@
+"""Сжатие ответов и статики gzip и, если установлен пакет brotli, brotli."""
+
+import gzip
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from django.conf import settings
+
+
+def available_encodings():
+    """Поддерживаемые кодировки в порядке предпочтения."""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def compress(data, encoding, best=False):
+    """Сжимает байты. best=True — максимальное сжатие для статики,
+    иначе быстрый уровень для ответов, которые сжимаются на каждый запрос.
+    """
+    if encoding == 'br':
+        quality = 11 if best else settings.BROTLI_QUALITY
+        return brotli.compress(data, quality=quality)
+    level = 9 if best else settings.GZIP_LEVEL
+    return gzip.compress(data, compresslevel=level, mtime=0)
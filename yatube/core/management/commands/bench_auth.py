@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from core.benchmark import benchmark_database, format_stats, measure
+
+User = get_user_model()
+
+PASSWORD = 'bench-password'
+
+
+class Command(BaseCommand):
+    help = 'Сравнивает пропускную способность входа для наборов хешеров.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=50)
+
+    def handle(self, *args, **options):
+        with benchmark_database():
+            for name, hashers in settings.PASSWORD_HASHER_PROFILES.items():
+                with override_settings(PASSWORD_HASHERS=hashers):
+                    User.objects.all().delete()
+                    User.objects.create_user(username='reader',
+                                             password=PASSWORD)
+                    client = Client()
+                    stats = measure(
+                        lambda: client.post(reverse('users:login'), {
+                            'username': 'reader', 'password': PASSWORD}),
+                        options['requests'])
+                self.stdout.write(format_stats(name, stats))
@@ -0,0 +1,44 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from core.benchmark import benchmark_database, format_stats, measure
+from posts.models import Follow, Post
+
+User = get_user_model()
+
+AUTHORS = 10
+POSTS_PER_AUTHOR = 3
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает накладные расходы движков сессий '
+            'на странице follow_index.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200)
+
+    def handle(self, *args, **options):
+        with benchmark_database():
+            user = self.seed()
+            for name, engine in settings.SESSION_ENGINES.items():
+                with override_settings(SESSION_ENGINE=engine):
+                    cache.clear()
+                    client = Client()
+                    client.force_login(user)
+                    stats = measure(
+                        lambda: client.get(reverse('posts:follow_index')),
+                        options['requests'])
+                self.stdout.write(format_stats(name, stats))
+
+    def seed(self):
+        user = User.objects.create_user(username='reader')
+        for number in range(AUTHORS):
+            author = User.objects.create_user(username=f'author{number}')
+            Follow.objects.create(user=user, author=author)
+            for post in range(POSTS_PER_AUTHOR):
+                Post.objects.create(author=author, text=f'Пост {post}')
+        return user
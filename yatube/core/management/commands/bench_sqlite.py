@@ -0,0 +1,113 @@
+import os
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from core.benchmark import benchmark_database
+from posts.models import Post
+
+User = get_user_model()
+
+#  режим SQLite по умолчанию: журнал отката и таймаут модуля sqlite3
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'DELETE',
+    'synchronous': 'FULL',
+    'busy_timeout': 5000,
+}
+
+
+class Command(BaseCommand):
+    help = ('Нагружает файловую SQLite читателями post_detail и '
+            'писателями add_comment с настройками по умолчанию и '
+            'с SQLITE_PRAGMAS. index не используется, так как он '
+            'отдается из кеша страницы.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--readers', type=int, default=8)
+        parser.add_argument('--writers', type=int, default=2)
+        parser.add_argument('--seconds', type=float, default=5)
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            self.stderr.write('Замер имеет смысл только для SQLite.')
+            return
+        runs = {'default': DEFAULT_PRAGMAS, 'tuned': settings.SQLITE_PRAGMAS}
+        for label, pragmas in runs.items():
+            with tempfile.TemporaryDirectory() as directory, \
+                    override_settings(SQLITE_PRAGMAS=pragmas), \
+                    benchmark_database(os.path.join(directory, 'bench.db')):
+                stats = self.run_load(options)
+            self.stdout.write(
+                f'{label:<8} reads {stats["reads"]:7.1f}/s  '
+                f'writes {stats["writes"]:6.1f}/s  '
+                f'read p95 {stats["p95"]:7.2f} ms  '
+                f'locked errors {stats["errors"]}')
+
+    def run_load(self, options):
+        author = User.objects.create_user(username='author')
+        post = Post.objects.create(author=author, text='Тестовый пост')
+        detail_url = reverse('posts:post_detail', kwargs={'post_id': post.id})
+        comment_url = reverse('posts:add_comment', kwargs={'post_id': post.id})
+        self.deadline = time.monotonic() + options['seconds']
+        self.lock = threading.Lock()
+        self.results = {'reads': [], 'writes': 0, 'errors': 0}
+
+        threads = (
+            [threading.Thread(target=self.read, args=(detail_url,))
+             for _ in range(options['readers'])]
+            + [threading.Thread(target=self.write,
+                                args=(author, comment_url))
+               for _ in range(options['writers'])]
+        )
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return self.summary(options['seconds'])
+
+    def request(self, send, *args):
+        """Выполняет запрос, считая ошибки блокировки БД.
+        Возвращает True, если запрос прошел.
+        """
+        try:
+            send(*args)
+        except OperationalError:
+            with self.lock:
+                self.results['errors'] += 1
+            return False
+        return True
+
+    def read(self, url):
+        client = Client()
+        while time.monotonic() < self.deadline:
+            started = time.perf_counter()
+            if self.request(client.get, url):
+                with self.lock:
+                    self.results['reads'].append(
+                        (time.perf_counter() - started) * 1000)
+        connection.close()
+
+    def write(self, author, url):
+        client = Client()
+        client.force_login(author)
+        while time.monotonic() < self.deadline:
+            if self.request(client.post, url, {'text': 'Комментарий'}):
+                with self.lock:
+                    self.results['writes'] += 1
+        connection.close()
+
+    def summary(self, seconds):
+        reads = sorted(self.results['reads']) or [0]
+        return {
+            'reads': len(self.results['reads']) / seconds,
+            'writes': self.results['writes'] / seconds,
+            'p95': reads[int(len(reads) * 0.95) - 1],
+            'errors': self.results['errors'],
+        }
@@ -0,0 +1,38 @@
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.test import Client
+from django.urls import reverse
+
+from core.benchmark import (benchmark_database, format_stats, measure,
+                            seed_content)
+
+
+class Command(BaseCommand):
+    help = ('Замеряет время ответа и число SQL-запросов страниц '
+            'index, group_list, profile, post_detail и follow_index.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=100)
+
+    def handle(self, *args, **options):
+        with benchmark_database():
+            user, group, post = seed_content()
+            client = Client()
+            client.force_login(user)
+            pages = {
+                'index': reverse('posts:index'),
+                'group_list': reverse('posts:group_list',
+                                      kwargs={'slug': group.slug}),
+                'profile': reverse('posts:profile',
+                                   kwargs={'username': post.author}),
+                'post_detail': reverse('posts:post_detail',
+                                       kwargs={'post_id': post.id}),
+                'follow_index': reverse('posts:follow_index'),
+            }
+            for name, address in pages.items():
+                def request():
+                    cache.clear()
+                    client.get(address)
+
+                stats = measure(request, options['requests'])
+                self.stdout.write(format_stats(name, stats))
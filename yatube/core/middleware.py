@@ -0,0 +1,120 @@
+import re
+
+from django.conf import settings
+from django.utils.cache import (cc_delim_re, patch_cache_control,
+                                patch_vary_headers)
+
+from .compression import available_encodings, compress
+from .routers import use_replicas
+
+PIN_COOKIE = 'db_pin'
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class ReplicaRoutingMiddleware:
+    """Включает чтение из реплик для страниц из REPLICA_READ_VIEWS.
+
+    После запроса с записью (POST и т.п.) ставится короткая cookie:
+    пока она жива, запросы пользователя читают из основной БД и видят
+    свои изменения, например профиль сразу после post_create.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            response = self.get_response(request)
+        finally:
+            use_replicas(False)
+        if (request.method not in SAFE_METHODS
+                and settings.DATABASE_REPLICAS):
+            response.set_cookie(PIN_COOKIE, '1',
+                                max_age=settings.REPLICA_PIN_SECONDS,
+                                httponly=True)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        use_replicas(
+            request.method in SAFE_METHODS
+            and PIN_COOKIE not in request.COOKIES
+            and request.resolver_match.view_name
+            in settings.REPLICA_READ_VIEWS
+        )
+
+
+class CompressionMiddleware:
+    """Сжимает текстовые ответы brotli или gzip по Accept-Encoding.
+
+    Замена GZipMiddleware: brotli выбирается, если его принимает клиент
+    и установлен пакет brotli. ETag становится слабым, чтобы проверка
+    If-None-Match продолжала работать для сжатого ответа.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (response.streaming
+                or response.has_header('Content-Encoding')
+                or len(response.content) < settings.COMPRESSION_MIN_LENGTH):
+            return response
+        content_type = response.get('Content-Type', '').split(';')[0]
+        if content_type not in settings.COMPRESSIBLE_TYPES:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        accepted = request.META.get('HTTP_ACCEPT_ENCODING', '')
+        encoding = next((name for name in available_encodings()
+                         if re.search(rf'\b{name}\b', accepted)), None)
+        if encoding is None:
+            return response
+
+        compressed = compress(response.content, encoding)
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+        response['Content-Encoding'] = encoding
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        return response
+
+
+class EdgeCacheMiddleware:
+    """Разрешает прокси кешировать страницы, помеченные core.cache.edge_cache.
+
+    Анонимный ответ без cookie получает Cache-Control: public, s-maxage,
+    а Cookie убирается из Vary: прокси отдает его всем посетителям без
+    cookie сессии и не обращается к Django. Ответы пользователям и ответы,
+    ставящие cookie, помечаются private. Стоит выше SessionMiddleware,
+    чтобы видеть cookie сессии и CSRF в готовом ответе.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (not getattr(response, 'edge_cacheable', False)
+                or request.method not in ('GET', 'HEAD')
+                or response.status_code not in (200, 304)):
+            return response
+        user = getattr(request, 'user', None)
+        if (user is not None and user.is_authenticated) or response.cookies:
+            patch_cache_control(response, private=True)
+            return response
+        patch_cache_control(response, public=True,
+                            max_age=settings.EDGE_CACHE_BROWSER_SECONDS,
+                            s_maxage=settings.EDGE_CACHE_SECONDS)
+        headers = cc_delim_re.split(response.get('Vary', ''))
+        vary = [header for header in headers
+                if header and header.lower() != 'cookie']
+        if vary:
+            response['Vary'] = ', '.join(vary)
+        elif response.has_header('Vary'):
+            del response['Vary']
+        return response
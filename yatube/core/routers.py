@@ -0,0 +1,34 @@
+import random
+import threading
+
+from django.conf import settings
+
+_state = threading.local()
+
+
+def use_replicas(enabled):
+    """Разрешает или запрещает чтение из реплик в текущем потоке."""
+    _state.use_replicas = enabled
+
+
+class ReplicaRouter:
+    """Отправляет чтение в реплики, запись — в основную БД.
+
+    Реплики используются, только если их включил
+    ReplicaRoutingMiddleware для текущего запроса.
+    """
+
+    def db_for_read(self, model, **hints):
+        if settings.DATABASE_REPLICAS and getattr(
+                _state, 'use_replicas', False):
+            return random.choice(settings.DATABASE_REPLICAS)
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in settings.DATABASE_REPLICAS
@@ -0,0 +1,31 @@
+from django.conf import settings
+
+#  PRAGMA, которые сохраняются в файле БД, а не в соединении
+PERSISTENT_PRAGMAS = ('journal_mode',)
+
+#  файлы БД и значения PERSISTENT_PRAGMAS, уже примененные процессом
+configured_files = set()
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    """Применяет SQLITE_PRAGMAS к новому соединению с SQLite.
+
+    journal_mode хранится в файле, поэтому выставляется один раз
+    на файл. Остальные PRAGMA действуют только на соединение
+    и отправляются одним вызовом executescript.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = dict(settings.SQLITE_PRAGMAS)
+    persistent = tuple((pragma, pragmas[pragma])
+                       for pragma in PERSISTENT_PRAGMAS if pragma in pragmas)
+    key = (connection.settings_dict['NAME'], persistent)
+    if key in configured_files:
+        for pragma, _ in persistent:
+            del pragmas[pragma]
+    else:
+        configured_files.add(key)
+    if pragmas:
+        connection.connection.executescript(''.join(
+            f'PRAGMA {pragma} = {value};'
+            for pragma, value in pragmas.items()))
@@ -0,0 +1,40 @@
+import os
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+from .compression import available_encodings, compress
+
+SUFFIXES = {'gzip': '.gz', 'br': '.br'}
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Хранилище статики с хешами в именах и заранее сжатыми копиями.
+
+    После collectstatic рядом с каждым файлом с хешем лежат .gz и .br,
+    которые nginx отдает через gzip_static/brotli_static без сжатия
+    на лету.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        processed = super().post_process(paths, dry_run=dry_run, **options)
+        for name, hashed_name, result in processed:
+            yield name, hashed_name, result
+            if dry_run or isinstance(result, Exception):
+                continue
+            if os.path.splitext(name)[1] in settings.COMPRESSIBLE_EXTENSIONS:
+                self.precompress(hashed_name or name)
+
+    def precompress(self, name):
+        """Сохраняет сжатые копии файла, если они меньше оригинала."""
+        with self.open(name) as original:
+            data = original.read()
+        for encoding in available_encodings():
+            compressed = compress(data, encoding, best=True)
+            if len(compressed) >= len(data):
+                continue
+            path = name + SUFFIXES[encoding]
+            if self.exists(path):
+                self.delete(path)
+            self._save(path, ContentFile(compressed))
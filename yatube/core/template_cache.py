@@ -0,0 +1,29 @@
+import os
+
+from django.conf import settings
+from django.template import engines
+
+
+def project_templates():
+    """Возвращает имена всех шаблонов из каталога templates/ проекта."""
+    for root, _, files in os.walk(settings.TEMPLATES_DIR):
+        for filename in files:
+            if filename.endswith('.html'):
+                path = os.path.join(root, filename)
+                yield os.path.relpath(
+                    path, settings.TEMPLATES_DIR).replace(os.sep, '/')
+
+
+def warm_template_cache():
+    """Компилирует шаблоны проекта заранее, при старте процесса.
+
+    Имеет смысл только с кеширующим загрузчиком: тогда первый запрос
+    каждого воркера не тратит время на разбор шаблонов.
+    Возвращает число скомпилированных шаблонов.
+    """
+    compiled = 0
+    for engine in engines.all():
+        for name in project_templates():
+            engine.get_template(name)
+            compiled += 1
+    return compiled
@@ -0,0 +1,72 @@
+import gzip
+import os
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Post
+
+User = get_user_model()
+
+
+class CompressionMiddlewareTest(TestCase):
+    """Тестируем сжатие HTML-ответов."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        author = User.objects.create_user(username='Marina')
+        cls.post = Post.objects.create(author=author, text='Тестовый пост')
+
+    def test_html_is_gzipped_when_accepted(self):
+        """Страница сжимается, если клиент принимает gzip."""
+        address = reverse('posts:post_detail',
+                          kwargs={'post_id': self.post.id})
+        plain = self.client.get(address)
+        response = self.client.get(address, HTTP_ACCEPT_ENCODING='gzip')
+
+        self.assertNotIn('Content-Encoding', plain)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+
+    def test_compressed_page_keeps_conditional_get(self):
+        """Слабый ETag сжатого ответа подходит для If-None-Match."""
+        address = reverse('posts:post_detail',
+                          kwargs={'post_id': self.post.id})
+        response = self.client.get(address, HTTP_ACCEPT_ENCODING='gzip')
+
+        self.assertTrue(response['ETag'].startswith('W/'))
+
+        repeated = self.client.get(address, HTTP_ACCEPT_ENCODING='gzip',
+                                   HTTP_IF_NONE_MATCH=response['ETag'])
+
+        self.assertEqual(repeated.status_code, 304)
+
+
+class CompressedStaticStorageTest(TestCase):
+    """Тестируем сжатые копии статики после collectstatic."""
+
+    def test_collectstatic_writes_hashed_and_compressed_files(self):
+        """Рядом с файлом с хешем в имени лежит его gzip-копия."""
+        with tempfile.TemporaryDirectory() as static_root, override_settings(
+                STATIC_ROOT=static_root,
+                STATICFILES_STORAGE=(
+                    'core.storage.CompressedManifestStaticFilesStorage')):
+            call_command('collectstatic', interactive=False, verbosity=0)
+            css_dir = os.path.join(static_root, 'css')
+            hashed = [name for name in os.listdir(css_dir)
+                      if name.startswith('bootstrap.min.')
+                      and name.endswith('.css')
+                      and name != 'bootstrap.min.css']
+
+            self.assertEqual(len(hashed), 1)
+
+            path = os.path.join(css_dir, hashed[0])
+            with open(path, 'rb') as original, \
+                    open(path + '.gz', 'rb') as compressed:
+                self.assertEqual(gzip.decompress(compressed.read()),
+                                 original.read())
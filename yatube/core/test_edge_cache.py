@@ -0,0 +1,97 @@
+import re
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class EdgeProxy:
+    """Заменитель обратного прокси: кеширует ответы с public и s-maxage
+    по адресу и заголовкам из Vary, а запросы с cookie сессии передает
+    в Django, как nginx с proxy_cache_bypass $cookie_sessionid.
+    """
+
+    def __init__(self, client):
+        self.client = client
+        self.storage = {}
+
+    def get(self, path, **headers):
+        if 'sessionid' in self.client.cookies:
+            return self.client.get(path, **headers)
+        for (cached_path, vary), response in self.storage.items():
+            if cached_path == path and all(
+                    headers.get(name) == value for name, value in vary):
+                return response
+        response = self.client.get(path, **headers)
+        cache_control = response.get('Cache-Control', '')
+        if ('public' in cache_control and 's-maxage' in cache_control
+                and not response.cookies):
+            names = [
+                'HTTP_' + name.upper().replace('-', '_')
+                for name in re.split(r'\s*,\s*', response.get('Vary', ''))
+                if name
+            ]
+            vary = tuple((name, headers.get(name)) for name in names)
+            self.storage[(path, vary)] = response
+        return response
+
+
+class EdgeCacheTest(TestCase):
+    """Тестируем кеширование анонимных страниц на прокси."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='Marina')
+        cls.group = Group.objects.create(title='Тестовая группа',
+                                         slug='test-slug',
+                                         description='Описание')
+        cls.post = Post.objects.create(author=cls.user, group=cls.group,
+                                       text='Тестовый пост')
+
+    def setUp(self):
+        cache.clear()
+        self.pages = [
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': 'test-slug'}),
+            reverse('posts:profile', kwargs={'username': 'Marina'}),
+            reverse('posts:post_detail', kwargs={'post_id': self.post.id}),
+        ]
+
+    def test_anonymous_pages_are_public_without_cookies(self):
+        """Анонимные страницы публичны, без cookie и без Vary: Cookie."""
+        for address in self.pages:
+            with self.subTest(address=address):
+                response = self.client.get(address)
+
+                self.assertIn('public', response['Cache-Control'])
+                self.assertIn('s-maxage', response['Cache-Control'])
+                self.assertNotIn('Cookie', response.get('Vary', ''))
+                self.assertFalse(response.cookies)
+
+    def test_proxy_serves_anonymous_pages_without_django(self):
+        """Повторный анонимный запрос отдает прокси без запросов к БД."""
+        proxy = EdgeProxy(Client())
+        for address in self.pages:
+            with self.subTest(address=address):
+                first = proxy.get(address)
+                with self.assertNumQueries(0):
+                    second = proxy.get(address)
+
+                self.assertIs(second, first)
+
+    def test_user_pages_are_private(self):
+        """Страницы пользователя помечены private и не кешируются прокси."""
+        client = Client()
+        client.force_login(self.user)
+        proxy = EdgeProxy(client)
+        for address in self.pages:
+            with self.subTest(address=address):
+                response = proxy.get(address)
+                self.assertIn('private', response['Cache-Control'])
+                self.assertIsNot(proxy.get(address), response)
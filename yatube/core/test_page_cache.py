@@ -0,0 +1,132 @@
+import shutil
+import tempfile
+import threading
+import time
+from unittest import mock
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache, caches
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from .cache import acquire_lock, release_lock, stale_while_revalidate
+
+THREADS = 10
+
+
+@override_settings(PAGE_CACHE_BETA=0)
+class StaleWhileRevalidateTest(SimpleTestCase):
+    """Тестируем защиту кеша страниц от одновременного пересчета.
+    Досрочное истечение выключено, кроме отдельного теста.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.renders = []
+
+        @stale_while_revalidate(0.2, key_prefix='test')
+        def view(request):
+            self.renders.append(request)
+            time.sleep(0.1)
+            return HttpResponse(f'render {len(self.renders)}')
+
+        self.view = view
+
+    def get(self):
+        request = RequestFactory().get('/')
+        request.user = AnonymousUser()
+        return self.view(request)
+
+    def get_concurrently(self):
+        """Делает THREADS одновременных запросов, возвращает ответы."""
+        barrier = threading.Barrier(THREADS)
+        responses = []
+
+        def worker():
+            barrier.wait()
+            responses.append(self.get().content)
+
+        threads = [threading.Thread(target=worker) for _ in range(THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return responses
+
+    def test_cold_cache_is_rendered_once(self):
+        """Без записи страницу считает один запрос, остальные ждут его."""
+        responses = self.get_concurrently()
+
+        self.assertEqual(len(self.renders), 1)
+        self.assertEqual(set(responses), {b'render 1'})
+
+    def test_expired_page_is_rendered_once_and_stale_is_served(self):
+        """После срока пересчет один, остальные получают старую версию."""
+        self.get()
+        time.sleep(0.25)
+
+        responses = self.get_concurrently()
+
+        self.assertEqual(len(self.renders), 2)
+        self.assertEqual(responses.count(b'render 2'), 1)
+        self.assertEqual(responses.count(b'render 1'), THREADS - 1)
+        self.assertEqual(self.get().content, b'render 2')
+
+    @override_settings(PAGE_CACHE_BETA=10)
+    def test_page_can_expire_early(self):
+        """Медленную страницу пересчитывают до срока."""
+        self.get()
+
+        with mock.patch('core.cache.random.random', return_value=0.5):
+            self.get()
+
+        self.assertEqual(len(self.renders), 2)
+
+    def test_expired_lock_of_other_request_is_kept(self):
+        """Запрос снимает только свою блокировку, а не взятую другим
+        после истечения ее срока.
+        """
+        token = acquire_lock('test:lock')
+        cache.set('test:lock', 'other')
+
+        release_lock('test:lock', token)
+
+        self.assertEqual(cache.get('test:lock'), 'other')
+        self.assertIsNone(acquire_lock('test:lock'))
+
+
+class FileCacheLockTest(StaleWhileRevalidateTest):
+    """Те же проверки на файловом кеше, где cache.add не атомарен
+    и блокировка держится в памяти процесса.
+    """
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        settings = override_settings(CACHES={'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': self.cache_dir,
+        }})
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.addCleanup(shutil.rmtree, self.cache_dir, True)
+        self.addCleanup(caches['default'].close)
+        super().setUp()
+
+    def test_expired_lock_of_other_request_is_kept(self):
+        """Блокировка не пишется в файловый кеш и снимается только
+        своим токеном.
+        """
+        token = acquire_lock('test:lock')
+
+        self.assertIsNone(cache.get('test:lock'))
+        self.assertIsNone(acquire_lock('test:lock'))
+
+        release_lock('test:lock', 'other')
+
+        self.assertIsNone(acquire_lock('test:lock'))
+
+        release_lock('test:lock', token)
+        token = acquire_lock('test:lock')
+
+        self.assertIsNotNone(token)
+        release_lock('test:lock', token)
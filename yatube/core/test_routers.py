@@ -0,0 +1,155 @@
+import shutil
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connections
+from django.http import HttpResponse
+from django.test import (RequestFactory, SimpleTestCase, TransactionTestCase,
+                         override_settings)
+from django.urls import resolve, reverse
+
+from posts.formatting import render_posts
+from posts.models import Post
+
+from .middleware import PIN_COOKIE, ReplicaRoutingMiddleware
+from .routers import ReplicaRouter
+
+User = get_user_model()
+
+#  отдельный файл SQLite без TEST MIRROR: чтение из реплики видно
+#  по данным, которых нет в основной БД
+REPLICA = 'replica_file'
+
+
+@override_settings(DATABASE_REPLICAS=['replica_0'])
+class ReplicaRouterTest(SimpleTestCase):
+
+    def route(self, request):
+        """Прогоняет запрос через middleware и возвращает алиас БД,
+        из которой view читает посты, и ответ.
+        """
+        used = []
+
+        def view(request):
+            used.append(ReplicaRouter().db_for_read(Post))
+            return HttpResponse()
+
+        def get_response(request):
+            middleware.process_view(request, view, (), {})
+            return view(request)
+
+        middleware = ReplicaRoutingMiddleware(get_response)
+        request.resolver_match = resolve(request.path)
+        response = middleware(request)
+        return used[0], response
+
+    def test_list_pages_read_from_replica(self):
+        """Страницы из REPLICA_READ_VIEWS читают из реплики,
+        остальные — из основной БД.
+        """
+        factory = RequestFactory()
+        pages = {
+            reverse('posts:index'): 'replica_0',
+            reverse('posts:profile', kwargs={'username': 'auth'}):
+                'replica_0',
+            reverse('posts:post_create'): 'default',
+        }
+        for address, expected in pages.items():
+            with self.subTest(address=address):
+                database, _ = self.route(factory.get(address))
+                self.assertEqual(database, expected)
+
+    def test_write_pins_user_to_primary(self):
+        """После записи чтение идет в основную БД, пока жива cookie."""
+        factory = RequestFactory()
+        _, response = self.route(factory.post(reverse('posts:post_create')))
+
+        self.assertIn(PIN_COOKIE, response.cookies)
+
+        request = factory.get(
+            reverse('posts:profile', kwargs={'username': 'auth'}))
+        request.COOKIES[PIN_COOKIE] = response.cookies[PIN_COOKIE].value
+        database, _ = self.route(request)
+
+        self.assertEqual(database, 'default')
+
+    def test_writes_and_background_reads_use_primary(self):
+        """Запись и чтение вне запроса идут в основную БД."""
+        router = ReplicaRouter()
+
+        self.assertEqual(router.db_for_write(Post), 'default')
+        self.assertEqual(router.db_for_read(Post), 'default')
+
+
+@override_settings(DATABASE_REPLICAS=[REPLICA])
+class ReplicaDatabaseTest(TransactionTestCase):
+    """Тестируем чтение из настоящей реплики — второго файла SQLite."""
+
+    databases = {'default', REPLICA}
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp()
+        connections.databases[REPLICA] = {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': f'{cls.directory}/replica.sqlite3',
+        }
+        connections.ensure_defaults(REPLICA)
+        connections.prepare_test_settings(REPLICA)
+        call_command('migrate', database=REPLICA, verbosity=0)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connections[REPLICA].close()
+        del connections[REPLICA]
+        del connections.databases[REPLICA]
+        shutil.rmtree(cls.directory, ignore_errors=True)
+
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username='auth')
+        self.author.save(using=REPLICA)
+        self.post = Post.objects.create(author=self.author,
+                                        text='Пост из основной БД')
+        replica_post = Post(author=self.author, text='Пост из реплики')
+        replica_post.make_preview()
+        render_posts([replica_post])
+        Post.objects.using(REPLICA).bulk_create([replica_post])
+        self.profile_url = reverse('posts:profile',
+                                   kwargs={'username': 'auth'})
+
+    def tearDown(self):
+        #  flush не очищает реплику: роутер запрещает в нее миграции
+        with connections[REPLICA].cursor() as cursor:
+            for table in ('posts_post', 'auth_user'):
+                cursor.execute(f'DELETE FROM {table}')
+
+    def test_list_page_reads_replica(self):
+        """Страница из REPLICA_READ_VIEWS показывает данные реплики."""
+        response = self.client.get(self.profile_url)
+
+        self.assertContains(response, 'Пост из реплики')
+        self.assertNotContains(response, 'Пост из основной БД')
+
+    def test_write_goes_to_primary_and_pins_reads(self):
+        """Запись попадает в основную БД, после нее пользователь
+        читает из основной БД.
+        """
+        self.client.force_login(self.author)
+        self.client.post(
+            reverse('posts:add_comment', kwargs={'post_id': self.post.id}),
+            {'text': 'Комментарий'})
+
+        self.assertTrue(self.post.comments.exists())
+        self.assertFalse(
+            Post.objects.using(REPLICA).filter(comments__isnull=False)
+            .exists())
+
+        response = self.client.get(self.profile_url)
+
+        self.assertContains(response, 'Пост из основной БД')
+        self.assertNotContains(response, 'Пост из реплики')
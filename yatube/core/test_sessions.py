@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+User = get_user_model()
+
+
+class SessionEngineTest(TestCase):
+
+    def test_session_storages_skip_session_table(self):
+        """Сессии в cookies и кеше не читаются из django_session."""
+        user = User.objects.create_user(username='Marina')
+        for storage in ('signed_cookies', 'cache', 'cached_db'):
+            with self.subTest(storage=storage), override_settings(
+                    SESSION_ENGINE=settings.SESSION_ENGINES[storage]):
+                client = Client()
+                client.force_login(user)
+                with CaptureQueriesContext(connection) as queries:
+                    response = client.get(reverse('posts:follow_index'))
+
+                self.assertEqual(response.context['user'], user)
+                self.assertFalse(any('django_session' in query['sql']
+                                     for query in queries))
@@ -0,0 +1,65 @@
+import os
+import tempfile
+from unittest import skipUnless
+
+from django.db import connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.test import TestCase
+
+from .sqlite import configured_files
+
+
+class SqlitePragmaTest(TestCase):
+
+    @skipUnless(connection.vendor == 'sqlite', 'только для SQLite')
+    def test_new_connections_are_tuned(self):
+        """Новое соединение с файлом SQLite переводится в WAL
+        и получает busy_timeout.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            wrapper = DatabaseWrapper({
+                **connection.settings_dict,
+                'NAME': os.path.join(directory, 'pragma.db'),
+            })
+            wrapper.ensure_connection()
+            try:
+                with wrapper.cursor() as cursor:
+                    cursor.execute('PRAGMA journal_mode')
+                    journal_mode = cursor.fetchone()[0]
+                    cursor.execute('PRAGMA synchronous')
+                    synchronous = cursor.fetchone()[0]
+                    cursor.execute('PRAGMA busy_timeout')
+                    busy_timeout = cursor.fetchone()[0]
+            finally:
+                wrapper.close()
+
+        self.assertEqual(journal_mode, 'wal')
+        self.assertEqual(synchronous, 1)
+        self.assertGreater(busy_timeout, 0)
+
+    @skipUnless(connection.vendor == 'sqlite', 'только для SQLite')
+    def test_journal_mode_is_set_once_per_file(self):
+        """journal_mode выставляется один раз на файл, а PRAGMA
+        соединения применяются к каждому новому соединению.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            settings_dict = {**connection.settings_dict,
+                             'NAME': os.path.join(directory, 'pragma.db')}
+            first = DatabaseWrapper(settings_dict)
+            first.ensure_connection()
+            first.close()
+            configured = {key[0] for key in configured_files}
+            second = DatabaseWrapper(settings_dict)
+            second.ensure_connection()
+            try:
+                with second.cursor() as cursor:
+                    cursor.execute('PRAGMA journal_mode')
+                    journal_mode = cursor.fetchone()[0]
+                    cursor.execute('PRAGMA synchronous')
+                    synchronous = cursor.fetchone()[0]
+            finally:
+                second.close()
+
+        self.assertIn(settings_dict['NAME'], configured)
+        self.assertEqual(journal_mode, 'wal')
+        self.assertEqual(synchronous, 1)
@@ -0,0 +1,85 @@
+from collections import Counter
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.template import engines
+from django.template.base import Template
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Group, Post
+
+from .template_cache import project_templates, warm_template_cache
+
+User = get_user_model()
+
+CACHED_TEMPLATES = [{
+    **settings.TEMPLATES[0],
+    'OPTIONS': {
+        **settings.TEMPLATES[0]['OPTIONS'],
+        'loaders': [('django.template.loaders.cached.Loader',
+                     settings.TEMPLATE_LOADERS)],
+    },
+}]
+
+
+@override_settings(TEMPLATES=CACHED_TEMPLATES)
+class TemplateCacheTest(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='Marina')
+        cls.group = Group.objects.create(title='Тестовая группа',
+                                         slug='test-slug',
+                                         description='Тестовое описание')
+        for number in range(3):
+            cls.post = Post.objects.create(author=cls.user, group=cls.group,
+                                           text=f'Тестовый пост {number}')
+
+    def setUp(self):
+        for engine in engines.all():
+            for loader in engine.engine.template_loaders:
+                loader.reset()
+        self.compiled = Counter()
+        compile_nodelist = Template.compile_nodelist
+
+        def counting_compile(template):
+            if template.origin.name.startswith(settings.TEMPLATES_DIR):
+                self.compiled[template.origin.template_name] += 1
+            return compile_nodelist(template)
+
+        patcher = mock.patch.object(Template, 'compile_nodelist',
+                                    counting_compile)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_templates_are_parsed_once_per_process(self):
+        """Шаблоны страниц разбираются не больше одного раза."""
+        client = Client()
+        client.force_login(self.user)
+        addresses = [
+            reverse('posts:group_list', kwargs={'slug': self.group.slug}),
+            reverse('posts:profile', kwargs={'username': self.user}),
+            reverse('posts:post_detail', kwargs={'post_id': self.post.id}),
+            reverse('posts:follow_index'),
+        ]
+        for _ in range(3):
+            for address in addresses:
+                client.get(address)
+
+        self.assertIn('posts/includes/post.html', self.compiled)
+        self.assertEqual(max(self.compiled.values()), 1)
+
+    def test_warm_up_compiles_every_project_template(self):
+        """Прогрев компилирует все шаблоны, и страницы их больше
+        не разбирают.
+        """
+        warm_template_cache()
+        warmed = Counter(self.compiled)
+        self.client.get(
+            reverse('posts:group_list', kwargs={'slug': self.group.slug}))
+
+        self.assertEqual(set(warmed), set(project_templates()))
+        self.assertEqual(self.compiled, warmed)
@@ -1,9 +1,56 @@
 from django.contrib import admin
+from django.http import StreamingHttpResponse
 
+from .export import export_lines, gzip_chunks
 from .models import Group, Post, Comment, Follow
 
 
-class PostAdmin(admin.ModelAdmin):
+class ExportMixin:
+    """Действия выгрузки выбранных строк в NDJSON и CSV, без сжатия
+    и в gzip.
+
+    Ответ отдается потоком и сжимается на лету, поэтому выгрузка
+    всей таблицы не собирается в памяти воркера.
+    """
+
+    actions = ('export_ndjson', 'export_csv', 'export_ndjson_gzip',
+               'export_csv_gzip')
+    export_name = None
+
+    def export(self, queryset, export_format, content_type,
+               compress=False):
+        lines = export_lines(queryset.order_by('pk'), self.export_name,
+                             export_format)
+        filename = f'{self.export_name}.{export_format}'
+        if compress:
+            lines = gzip_chunks(lines)
+            content_type = 'application/gzip'
+            filename += '.gz'
+        response = StreamingHttpResponse(lines, content_type=content_type)
+        response['Content-Disposition'] = (
+            f'attachment; filename="{filename}"')
+        return response
+
+    def export_ndjson(self, request, queryset):
+        return self.export(queryset, 'ndjson', 'application/x-ndjson')
+    export_ndjson.short_description = 'Выгрузить в NDJSON'
+
+    def export_csv(self, request, queryset):
+        return self.export(queryset, 'csv', 'text/csv; charset=utf-8')
+    export_csv.short_description = 'Выгрузить в CSV'
+
+    def export_ndjson_gzip(self, request, queryset):
+        return self.export(queryset, 'ndjson', 'application/x-ndjson',
+                           compress=True)
+    export_ndjson_gzip.short_description = 'Выгрузить в NDJSON (gzip)'
+
+    def export_csv_gzip(self, request, queryset):
+        return self.export(queryset, 'csv', 'text/csv; charset=utf-8',
+                           compress=True)
+    export_csv_gzip.short_description = 'Выгрузить в CSV (gzip)'
+
+
+class PostAdmin(ExportMixin, admin.ModelAdmin):
     """
     Адиминистрируем модель Post, источником конфигурации для неё назначаем
     класс PostAdmin.
@@ -26,9 +73,18 @@ class PostAdmin(admin.ModelAdmin):
     search_fields = ('text',)
     list_filter = ('pub_date',)
     empty_value_display = '-пусто-'
+    export_name = 'posts'
+
+
+class CommentAdmin(ExportMixin, admin.ModelAdmin):
+    export_name = 'comments'
+
+
+class FollowAdmin(ExportMixin, admin.ModelAdmin):
+    export_name = 'follows'
 
 
 admin.site.register(Post, PostAdmin)
 admin.site.register(Group)
-admin.site.register(Comment)
-admin.site.register(Follow)
+admin.site.register(Comment, CommentAdmin)
+admin.site.register(Follow, FollowAdmin)
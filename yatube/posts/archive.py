@@ -0,0 +1,130 @@
+"""Архив: статические снимки старых страниц постов.
+
+Архивные страницы нумеруются от самых старых постов, поэтому новые
+посты их не сдвигают. Полная страница, самый новый пост которой
+старше ARCHIVE_AFTER_DAYS, один раз рендерится в HTML-файл в
+ARCHIVE_ROOT и дальше отдается из него без запросов к постам.
+В снимок попадает только список постов: шапка с пользователем
+рендерится на каждый запрос. Правка поста удаляет снимок его страницы,
+удаление — снимки его страницы и всех следующих, которые сдвигаются.
+"""
+
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from .models import Post
+from .utils import POSTS_PER_PAGE, card_posts
+
+SITE_SCOPE = 'all'
+
+
+def author_scope(author_id):
+    return os.path.join('profile', str(author_id))
+
+
+def snapshot_path(scope, number):
+    return os.path.join(settings.ARCHIVE_ROOT, scope, f'{number}.html')
+
+
+def archive_posts(scope):
+    """Посты области архива от старых к новым."""
+    posts = card_posts(Post.objects.order_by('pub_date', 'id'))
+    if scope == SITE_SCOPE:
+        return posts
+    return posts.filter(author_id=int(os.path.basename(scope)))
+
+
+def is_archived(posts):
+    """Страница неизменна: она полная и ее посты старше порога."""
+    threshold = timezone.now() - timedelta(days=settings.ARCHIVE_AFTER_DAYS)
+    return len(posts) == POSTS_PER_PAGE and posts[-1].pub_date < threshold
+
+
+def write_snapshot(path, html):
+    """Пишет файл атомарно, чтобы читатели не увидели его наполовину."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    descriptor, temp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+    with os.fdopen(descriptor, 'w', encoding='utf-8') as snapshot:
+        snapshot.write(html)
+    os.replace(temp_path, path)
+
+
+def get_archive_page(scope, number):
+    """HTML списка постов архивной страницы number (с 1)
+    или None, если на странице нет постов.
+    """
+    if number < 1:
+        return None
+    path = snapshot_path(scope, number)
+    try:
+        with open(path, encoding='utf-8') as snapshot:
+            return snapshot.read()
+    except FileNotFoundError:
+        pass
+    start = (number - 1) * POSTS_PER_PAGE
+    posts = list(archive_posts(scope)[start:start + POSTS_PER_PAGE])
+    if not posts:
+        return None
+    html = render_to_string('posts/includes/archive_page.html',
+                            {'posts': posts})
+    if is_archived(posts):
+        write_snapshot(path, html)
+    return html
+
+
+def has_next_page(scope, number):
+    """Есть ли посты после страницы number. Если следующая страница
+    уже в снимке, запроса нет.
+    """
+    if os.path.exists(snapshot_path(scope, number + 1)):
+        return True
+    start = number * POSTS_PER_PAGE
+    return bool(archive_posts(scope).values_list('id', flat=True)[
+        start:start + 1])
+
+
+def drop_snapshots(scope, first_number, following=False):
+    """Удаляет снимок страницы first_number, а с following — и всех
+    следующих страниц области.
+    """
+    directory = os.path.join(settings.ARCHIVE_ROOT, scope)
+    if not os.path.isdir(directory):
+        return
+    for name in os.listdir(directory):
+        number, extension = os.path.splitext(name)
+        if extension != '.html' or not number.isdigit():
+            continue
+        number = int(number)
+        if number == first_number or (following and number > first_number):
+            os.remove(os.path.join(directory, name))
+
+
+def invalidate_post(post, deleted=False):
+    """Сбрасывает снимки, в которые попадает измененный или удаленный пост.
+
+    Посты новее порога не могут лежать на архивной странице,
+    а страницы после них тоже не архивные, поэтому их пропускаем.
+    """
+    threshold = timezone.now() - timedelta(days=settings.ARCHIVE_AFTER_DAYS)
+    if post.pub_date is None or post.pub_date >= threshold:
+        return
+    older = Q(pub_date__lt=post.pub_date) | Q(pub_date=post.pub_date,
+                                              id__lt=post.pk)
+    for scope, posts in (
+            (SITE_SCOPE, Post.objects.all()),
+            (author_scope(post.author_id),
+             Post.objects.filter(author_id=post.author_id))):
+        number = posts.filter(older).count() // POSTS_PER_PAGE + 1
+        drop_snapshots(scope, number, following=deleted)
+
+
+def clear_archive():
+    """Удаляет все снимки, например после массового импорта."""
+    shutil.rmtree(settings.ARCHIVE_ROOT, ignore_errors=True)
@@ -0,0 +1,97 @@
+import hashlib
+from functools import wraps
+
+from django.db.models import DateTimeField, Max, OuterRef, Subquery
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import quote_etag
+
+from .groups import (AUTHORS_VERSION_KEY, GROUPS_VERSION_KEY,
+                     bump_version, get_version)
+from .models import Comment, Group, Post, User
+from .utils import count_related, profile_counters
+
+
+def bump_authors():
+    """Меняет ETag всех страниц после переименования пользователя."""
+    bump_version(AUTHORS_VERSION_KEY)
+
+
+def conditional_page(state_func):
+    """Отвечает 304 Not Modified, если страница не менялась.
+
+    state_func(request, **kwargs) одним запросом возвращает части ETag
+    или None, если объекта нет. Шаблон при совпадении не рендерится,
+    а строки постов не читаются. ETag сохраняется в request.page_etag
+    для stale_while_revalidate. ETag учитывает текущего пользователя
+    и версии групп и авторов: их названия и имена выводятся на страницах,
+    но не входят в состояние. Last-Modified не отдается: удаление поста
+    или комментария и переименования не сдвигают дату вперед.
+    """
+    def decorator(view):
+        @wraps(view)
+        def inner(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view(request, *args, **kwargs)
+            parts = state_func(request, *args, **kwargs)
+            if parts is None:
+                return view(request, *args, **kwargs)
+            viewer = (request.user.pk if request.user.is_authenticated
+                      else 'anonymous')
+            versions = (get_version(GROUPS_VERSION_KEY),
+                        get_version(AUTHORS_VERSION_KEY))
+            etag = quote_etag(hashlib.md5('|'.join(
+                map(str, (viewer, *versions, *parts))).encode()).hexdigest())
+            #  кеш страницы под декоратором хранит ответы по ETag
+            request.page_etag = etag
+            response = get_conditional_response(request, etag=etag)
+            if response is None:
+                response = view(request, *args, **kwargs)
+            if response.status_code in (200, 304):
+                response.setdefault('ETag', etag)
+            patch_vary_headers(response, ('Cookie',))
+            return response
+        return inner
+    return decorator
+
+
+def latest(model, field, related, outer_field='pk'):
+    """Подзапрос с наибольшим значением field среди связанных объектов."""
+    values = (model.objects.filter(**{related: OuterRef(outer_field)})
+              .order_by().values(related).annotate(latest=Max(field))
+              .values('latest'))
+    return Subquery(values, output_field=DateTimeField())
+
+
+def group_state(request, slug):
+    group = Group.objects.filter(slug=slug).annotate(
+        posts_count=count_related(Post, 'group'),
+        last_update=latest(Post, 'updated', 'group'),
+    ).values('pk', 'title', 'description', 'posts_count',
+             'last_update').first()
+    if group is None:
+        return None
+    return group.values()
+
+
+def profile_state(request, username):
+    author = User.objects.filter(username=username).annotate(
+        last_update=latest(Post, 'updated', 'author'),
+        **profile_counters(request.user),
+    ).values('pk', 'first_name', 'last_name', 'posts_count',
+             'followers_count', 'follows_count', 'is_following',
+             'last_update').first()
+    if author is None:
+        return None
+    return author.values()
+
+
+def post_state(request, post_id):
+    post = Post.objects.filter(pk=post_id).annotate(
+        comments_count=count_related(Comment, 'post'),
+        last_comment=latest(Comment, 'created', 'post'),
+        author_posts_count=count_related(Post, 'author', 'author'),
+    ).values('pk', 'updated', 'group_id', 'views', 'comments_count',
+             'last_comment', 'author_posts_count').first()
+    if post is None:
+        return None
+    return post.values()
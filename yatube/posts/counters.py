@@ -0,0 +1,74 @@
+"""Буферизованный счетчик просмотров постов.
+
+Просмотры считает маячок posts:post_view, который страница поста
+подгружает картинкой: сама страница может прийти из кеша прокси
+или ответом 304 и до view не дойти. Просмотры копятся в памяти
+процесса и раз в VIEW_FLUSH_SECONDS (или при VIEW_FLUSH_SIZE
+накопленных просмотров) записываются в Post.views одним UPDATE
+с CASE по id постов. При падении процесса
+теряется не больше одного такого буфера; при штатной остановке
+буфер сбрасывается через atexit.
+"""
+
+import atexit
+import logging
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.db.models import Case, F, IntegerField, Value, When
+
+from .models import Post
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_buffer = Counter()
+_last_flush = time.monotonic()
+
+
+def record_view(post_id):
+    """Учитывает просмотр поста, при необходимости сбрасывает буфер."""
+    with _lock:
+        _buffer[post_id] += 1
+        due = sum(_buffer.values()) >= settings.VIEW_FLUSH_SIZE
+        if settings.VIEW_FLUSH_SECONDS is not None:
+            due = due or (time.monotonic() - _last_flush
+                          >= settings.VIEW_FLUSH_SECONDS)
+    if due:
+        flush_views()
+
+
+def flush_views():
+    """Записывает накопленные просмотры в БД одним запросом.
+
+    Если запись не удалась, просмотры возвращаются в буфер до
+    следующего сброса, а ошибка только пишется в лог.
+    """
+    global _last_flush
+    with _lock:
+        views = dict(_buffer)
+        _buffer.clear()
+        _last_flush = time.monotonic()
+    if not views:
+        return 0
+    increment = Case(
+        *[When(pk=post_id, then=Value(count))
+          for post_id, count in views.items()],
+        default=Value(0), output_field=IntegerField())
+    try:
+        Post.objects.filter(pk__in=views).update(
+            views=F('views') + increment)
+    except DatabaseError:
+        logger.exception('Не удалось записать просмотры постов')
+        with _lock:
+            _buffer.update(views)
+        return 0
+    return len(views)
+
+
+if not settings.TESTING:
+    # В тестах к выходу процесса тестовая БД уже удалена.
+    atexit.register(flush_views)
@@ -0,0 +1,186 @@
+from collections import defaultdict
+from heapq import merge
+from itertools import islice
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+
+from .models import FeedEntry, Follow, FollowerCount, Post
+from .utils import card_posts, chunked
+
+
+def is_celebrity(author_id):
+    """Проверяет, превышает ли число подписчиков автора порог."""
+    return FollowerCount.objects.filter(
+        author_id=author_id,
+        followers__gte=settings.FEED_CELEBRITY_THRESHOLD).exists()
+
+
+def change_follower_count(author_id, delta):
+    """Меняет число подписчиков автора на delta одним UPDATE, без
+    подсчета подписок. Возвращает прежнее и новое значения.
+    """
+    counts = FollowerCount.objects.filter(author_id=author_id)
+    if delta < 0:
+        counts = counts.filter(followers__gte=-delta)
+    if not counts.update(followers=F('followers') + delta) and delta > 0:
+        try:
+            with transaction.atomic():
+                FollowerCount.objects.create(author_id=author_id,
+                                             followers=delta)
+        except IntegrityError:
+            #  строку только что создала параллельная подписка
+            counts.update(followers=F('followers') + delta)
+    new = FollowerCount.objects.filter(author_id=author_id).values_list(
+        'followers', flat=True).first() or 0
+    return new - delta, new
+
+
+def recount_followers():
+    """Пересчитывает счетчики всех авторов по таблице подписок,
+    например после массового импорта подписок без сигналов.
+    """
+    counts = Follow.objects.order_by().values('author_id').annotate(
+        followers=Count('id'))
+    with transaction.atomic():
+        FollowerCount.objects.all().delete()
+        for batch in chunked(counts.iterator(), settings.FEED_BACKFILL_SIZE):
+            FollowerCount.objects.bulk_create(
+                [FollowerCount(**count) for count in batch])
+
+
+def materialize(author_id, user_ids):
+    """Добавляет все посты автора в ленты пользователей user_ids
+    пачками по FEED_BACKFILL_SIZE постов.
+    """
+    posts = Post.objects.filter(author_id=author_id).order_by().values_list(
+        'id', 'pub_date')
+    for batch in chunked(posts.iterator(), settings.FEED_BACKFILL_SIZE):
+        FeedEntry.objects.bulk_create(
+            [FeedEntry(user_id=user_id, post_id=post_id, author_id=author_id,
+                       pub_date=pub_date)
+             for user_id in user_ids for post_id, pub_date in batch],
+            batch_size=settings.FEED_BACKFILL_SIZE,
+            ignore_conflicts=True,
+        )
+
+
+def materialize_followers(author_id):
+    """Раскладывает все посты автора по лентам всех его подписчиков,
+    например когда автор перестал быть «знаменитостью».
+    """
+    followers = Follow.objects.filter(author_id=author_id).order_by(
+    ).values_list('user_id', flat=True)
+    for user_ids in chunked(followers.iterator(),
+                            settings.FEED_BACKFILL_SIZE):
+        materialize(author_id, user_ids)
+
+
+def fan_out_post(post):
+    """Раскладывает новый пост по лентам подписчиков автора.
+
+    Посты «знаменитостей» не материализуются: они подтягиваются
+    при чтении ленты, поэтому стоимость публикации ограничена порогом.
+    """
+    if is_celebrity(post.author_id):
+        return
+    followers = Follow.objects.filter(
+        author_id=post.author_id).values_list('user_id', flat=True)
+    FeedEntry.objects.bulk_create(
+        [FeedEntry(user_id=user_id, post=post, author_id=post.author_id,
+                   pub_date=post.pub_date) for user_id in followers],
+        ignore_conflicts=True,
+    )
+
+
+def backfill_follow(follow):
+    """Добавляет в ленту подписчика все посты нового автора."""
+    if not is_celebrity(follow.author_id):
+        materialize(follow.author_id, [follow.user_id])
+
+
+def refresh_author_feeds(posts):
+    """Раскладывает посты по лентам подписчиков их авторов пачками.
+
+    Нужна после bulk_create постов, который не шлет post_save
+    и не вызывает fan_out_post. Прежние посты авторов не трогаются.
+    """
+    if settings.FEED_MODE != 'hybrid':
+        return
+    by_author = defaultdict(list)
+    for post in posts:
+        by_author[post.author_id].append((post.pk, post.pub_date))
+    for author_id, author_posts in by_author.items():
+        if is_celebrity(author_id):
+            continue
+        followers = Follow.objects.filter(author_id=author_id).order_by(
+        ).values_list('user_id', flat=True)
+        for user_ids in chunked(followers.iterator(),
+                                settings.FEED_BACKFILL_SIZE):
+            FeedEntry.objects.bulk_create(
+                [FeedEntry(user_id=user_id, post_id=post_id,
+                           author_id=author_id, pub_date=pub_date)
+                 for user_id in user_ids
+                 for post_id, pub_date in author_posts],
+                batch_size=settings.FEED_BACKFILL_SIZE,
+                ignore_conflicts=True,
+            )
+
+
+def drop_follow(follow):
+    """Убирает из ленты посты автора, от которого отписались."""
+    FeedEntry.objects.filter(user_id=follow.user_id,
+                             author_id=follow.author_id).delete()
+
+
+class HybridFeed:
+    """Лента подписок, совместимая с Paginator.
+
+    Материализованные записи сливаются (heap-merge по pub_date)
+    с постами «знаменитостей», которые выбираются при чтении.
+    Для страницы N из каждого источника читается не больше
+    N * POSTS_PER_PAGE строк.
+    """
+
+    def __init__(self, user):
+        self.celebrities = list(FollowerCount.objects.filter(
+            author__following__user=user,
+            followers__gte=settings.FEED_CELEBRITY_THRESHOLD,
+        ).values_list('author_id', flat=True))
+        posts = card_posts(Post.objects.all())
+        #  сортировка по дате записи ленты идет по индексу (user, -pub_date)
+        self.materialized = posts.filter(feed_entries__user=user).exclude(
+            author_id__in=self.celebrities).order_by(
+            '-feed_entries__pub_date')
+        self.pulled = posts.filter(author_id__in=self.celebrities)
+
+    def count(self):
+        total = self.materialized.count()
+        if self.celebrities:
+            total += self.pulled.count()
+        return total
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        start, stop = index.start or 0, index.stop
+        sources = [source[:stop] for source in self.sources()]
+        posts = merge(*sources, key=lambda post: post.pub_date, reverse=True)
+        return list(islice(posts, start, stop))
+
+    def sources(self):
+        """Запросы, из которых собирается лента, по убыванию pub_date."""
+        if self.celebrities:
+            return [self.materialized, self.pulled]
+        return [self.materialized]
+
+
+def get_follow_feed(user):
+    """Возвращает посты ленты подписок в соответствии с FEED_MODE."""
+    if settings.FEED_MODE == 'hybrid':
+        return HybridFeed(user)
+    return card_posts(Post.objects.filter(author__following__user=user))
@@ -0,0 +1,72 @@
+"""Рендеринг текста поста в HTML.
+
+Текст экранируется, ссылки и адреса почты становятся ссылками,
+упоминания @username существующих пользователей — ссылками на профиль,
+переводы строк — <br>. Результат считается один раз при сохранении
+поста и хранится в модели, шаблоны выводят его как есть.
+"""
+
+import re
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils.html import format_html, urlize
+from django.utils.text import normalize_newlines
+
+#  «@» в начале слова, не внутри адреса почты или пути ссылки
+MENTION_RE = re.compile(r'(?<![\w/.@])@(\w(?:[\w.+-]*\w)?)')
+
+#  ссылки, которые уже расставил urlize, — внутри них упоминания не ищутся
+ANCHOR_RE = re.compile(r'(<a [^>]*>.*?</a>)', re.S)
+
+
+def find_mentions(text):
+    """Имена пользователей, упомянутые в тексте."""
+    return set(MENTION_RE.findall(text))
+
+
+def known_usernames(texts, users=None):
+    """Имена из упоминаний в texts, для которых есть пользователь.
+    Один запрос на все тексты.
+    """
+    mentions = set().union(*(find_mentions(text) for text in texts))
+    if not mentions:
+        return set()
+    if users is None:
+        users = get_user_model().objects
+    return set(users.filter(username__in=mentions).values_list(
+        'username', flat=True))
+
+
+def link_mention(match, usernames):
+    username = match.group(1)
+    if username not in usernames:
+        return match.group(0)
+    return format_html('<a href="{}">@{}</a>',
+                       reverse('posts:profile', args=[username]), username)
+
+
+def link_mentions(html, usernames):
+    """Превращает упоминания в ссылки только в тексте вне ссылок."""
+    parts = ANCHOR_RE.split(html)
+    for index in range(0, len(parts), 2):
+        parts[index] = MENTION_RE.sub(
+            lambda match: link_mention(match, usernames), parts[index])
+    return ''.join(parts)
+
+
+def render_text(text, usernames=frozenset()):
+    """Безопасный HTML текста, usernames — имена, которые можно
+    превратить в ссылки на профили.
+    """
+    html = urlize(normalize_newlines(text), nofollow=True, autoescape=True)
+    html = link_mentions(html, usernames)
+    return html.replace('\n', '<br>')
+
+
+def render_posts(posts, users=None):
+    """Заполняет text_html и preview_html постов."""
+    usernames = known_usernames((post.text for post in posts), users)
+    for post in posts:
+        post.text_html = render_text(post.text, usernames)
+        post.preview_html = render_text(post.text_preview, usernames)
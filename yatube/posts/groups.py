@@ -0,0 +1,96 @@
+"""Кеш групп и первых страниц групп.
+
+Группы меняются редко, поэтому каждый процесс держит словарь slug → Group.
+Актуальность проверяется по версии в общем кеше: сохранение или удаление
+группы увеличивает версию, и все воркеры перечитывают группу при
+следующем обращении. Первая страница и число постов группы кешируются
+под версией постов группы, которую меняют изменения ее постов;
+первая страница — еще и под версией авторов, чьи имена она хранит.
+bulk_create и update() сигналов не шлют: после них нужно вызвать
+bump_group_posts вручную.
+"""
+
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import Group
+from .utils import POSTS_PER_PAGE, card_posts
+
+GROUPS_VERSION_KEY = 'groups:version'
+
+AUTHORS_VERSION_KEY = 'authors:version'
+
+_groups = {}
+
+
+def get_version(key):
+    """Версия из общего кеша. Версии случайные, чтобы после очистки
+    кеша не совпасть со старыми записями.
+    """
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(key):
+    """Заменяет версию новой. Это одна запись, а не incr (на файловом
+    кеше это чтение и запись): одновременные смены не теряются, любая
+    из них дает версию, под которой старых записей нет.
+    """
+    cache.set(key, uuid.uuid4().hex, None)
+
+
+def bump_groups():
+    """Сбрасывает кеш групп во всех процессах."""
+    bump_version(GROUPS_VERSION_KEY)
+
+
+def group_posts_version_key(group_id):
+    return f'groups:{group_id}:posts_version'
+
+
+def bump_group_posts(*group_ids):
+    """Сбрасывает кешированные первую страницу и число постов групп."""
+    for group_id in set(group_ids):
+        if group_id is not None:
+            bump_version(group_posts_version_key(group_id))
+
+
+def get_group(slug):
+    """Группа по slug из кеша процесса или None, если ее нет."""
+    version = get_version(GROUPS_VERSION_KEY)
+    cached = _groups.get(slug)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    group = Group.objects.filter(slug=slug).first()
+    if group is not None:
+        _groups[slug] = (version, group)
+    return group
+
+
+def group_page_posts(group, page_number):
+    """Посты для пагинатора страницы группы и их число.
+
+    Для первой страницы отдается кешированный список постов,
+    для остальных — запрос с кешированным числом постов.
+    """
+    version = get_version(group_posts_version_key(group.pk))
+    prefix = f'groups:{group.pk}:{version}'
+    count = cache.get(f'{prefix}:count')
+    if count is None:
+        count = group.posts.count()
+        cache.set(f'{prefix}:count', count, settings.GROUP_CACHE_SECONDS)
+    posts = card_posts(group.posts.all())
+    if page_number not in (None, '1'):
+        return posts, count
+    #  в списке лежат авторы постов, их имена меняются без версии постов
+    key = f'{prefix}:{get_version(AUTHORS_VERSION_KEY)}:first_page'
+    first_page = cache.get(key)
+    if first_page is None:
+        first_page = list(posts[:POSTS_PER_PAGE])
+        cache.set(key, first_page, settings.GROUP_CACHE_SECONDS)
+    return first_page, count
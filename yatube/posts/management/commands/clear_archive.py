@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from posts.archive import clear_archive
+
+
+class Command(BaseCommand):
+    help = ('Удаляет снимки архивных страниц, например после '
+            'переименования автора или группы. Снимки создаются '
+            'заново при первом запросе.')
+
+    def handle(self, *args, **options):
+        clear_archive()
+        self.stdout.write('Снимки архива удалены.')
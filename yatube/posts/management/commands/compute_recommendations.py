@@ -0,0 +1,34 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from posts.recommendations import compute_shard, init_worker, load_graph
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает рекомендации авторов для подписки.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top-k', type=int,
+                            default=settings.RECOMMENDATIONS_TOP_K)
+        parser.add_argument('--shards', type=int, default=1,
+                            help='На сколько шардов делить пользователей.')
+        parser.add_argument('--processes', type=int, default=1,
+                            help='Размер пула процессов.')
+
+    def handle(self, *args, **options):
+        shards, top_k = options['shards'], options['top_k']
+        if options['processes'] > 1:
+            # Соединения с БД нельзя разделять между процессами.
+            connections.close_all()
+            with ProcessPoolExecutor(options['processes'],
+                                     initializer=init_worker) as executor:
+                saved = sum(executor.map(compute_shard, range(shards),
+                                         [shards] * shards, [top_k] * shards))
+        else:
+            graph = load_graph()
+            saved = sum(compute_shard(shard, shards, top_k, graph)
+                        for shard in range(shards))
+        self.stdout.write(f'Сохранено рекомендаций: {saved}')
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from posts.trending import compute_trending
+
+
+class Command(BaseCommand):
+    help = ('Пересчитывает рейтинг популярных постов. Запускается '
+            'по расписанию, например cron раз в 10 минут.')
+
+    def handle(self, *args, **options):
+        self.stdout.write(f'Постов в рейтинге: {compute_trending()}')
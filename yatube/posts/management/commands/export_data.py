@@ -0,0 +1,57 @@
+import gzip
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date, parse_datetime
+
+from posts.export import (CHUNK_SIZE, EXPORTS, FORMATS, export_lines,
+                          export_queryset)
+
+
+def parse_since(value):
+    moment = parse_datetime(value) or parse_date(value)
+    if moment is None:
+        raise CommandError(f'Неверная дата: {value}')
+    return moment
+
+
+class Command(BaseCommand):
+    help = ('Потоково выгружает посты, комментарии или подписки в NDJSON '
+            'или CSV. Для инкрементальной выгрузки используйте --since '
+            'или --after-id с последним id прошлой выгрузки.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('table', choices=EXPORTS)
+        parser.add_argument('--format', default='ndjson', choices=FORMATS)
+        parser.add_argument('--output', default='-',
+                            help='Файл выгрузки, «-» — stdout.')
+        parser.add_argument('--gzip', action='store_true')
+        parser.add_argument('--since', type=parse_since,
+                            help='Дата публикации, с которой выгружать.')
+        parser.add_argument('--after-id', type=int)
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        name = options['table']
+        try:
+            queryset = export_queryset(name, options['since'],
+                                       options['after_id'])
+        except ValueError as error:
+            raise CommandError(error)
+        lines = export_lines(queryset, name, options['format'],
+                             options['chunk_size'])
+
+        output = options['output']
+        if output == '-' and not options['gzip']:
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+        if output == '-':
+            output = sys.stdout.buffer
+        if options['gzip'] or str(output).endswith('.gz'):
+            stream = gzip.open(output, 'wt', encoding='utf-8', newline='')
+        else:
+            stream = open(output, 'w', encoding='utf-8', newline='')
+        with stream:
+            for line in lines:
+                stream.write(line)
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from posts.importer import BATCH_SIZE, PostImporter, read_rows
+
+
+class Command(BaseCommand):
+    help = ('Импортирует посты из NDJSON или CSV (в том числе .gz) '
+            'пачками bulk_create. Поля строки: text, author (username), '
+            'group (slug), pub_date, image.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--format', choices=('ndjson', 'csv'),
+                            help='По умолчанию определяется по расширению.')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument('--keep-pub-date', action='store_true',
+                            help='Сохранять pub_date из файла.')
+        parser.add_argument('--images-dir',
+                            help='Каталог с картинками из поля image.')
+        parser.add_argument('--image-workers', type=int, default=4)
+        parser.add_argument('--create-missing', action='store_true',
+                            help='Создавать неизвестных авторов и группы.')
+
+    def handle(self, *args, **options):
+        importer = PostImporter(
+            batch_size=options['batch_size'],
+            keep_pub_date=options['keep_pub_date'],
+            images_dir=options['images_dir'],
+            image_workers=options['image_workers'],
+            create_missing=options['create_missing'],
+        )
+        stats = importer.run(read_rows(options['path'], options['format']))
+        self.stdout.write(
+            f'Импортировано {stats["imported"]} постов за '
+            f'{stats["seconds"]:.1f} с ({stats["rate"]:.0f} строк/с), '
+            f'пропущено {stats["skipped"]}.')
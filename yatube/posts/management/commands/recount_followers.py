@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from posts.feed import recount_followers
+from posts.models import FollowerCount
+
+
+class Command(BaseCommand):
+    help = ('Пересчитывает число подписчиков всех авторов по таблице '
+            'подписок. Подписки и отписки меняют счетчики сами, команда '
+            'нужна после массовой загрузки подписок без сигналов.')
+
+    def handle(self, *args, **options):
+        recount_followers()
+        self.stdout.write(
+            f'Пересчитано авторов: {FollowerCount.objects.count()}')
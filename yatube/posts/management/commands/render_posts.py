@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from posts.archive import clear_archive
+from posts.formatting import render_posts
+from posts.groups import bump_group_posts
+from posts.models import Post
+from posts.utils import chunked
+
+FIELDS = ('text_html', 'preview_html', 'updated')
+
+
+class Command(BaseCommand):
+    help = ('Заново рендерит HTML текста постов, например после '
+            'изменения правил форматирования или регистрации '
+            'упомянутых пользователей. Сохраняются только изменившиеся '
+            'посты, кеши их страниц сбрасываются.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        posts = Post.objects.only(
+            'id', 'group', 'text', 'text_preview', *FIELDS[:2]).order_by()
+        changed = 0
+        group_ids = set()
+        for batch in chunked(posts.iterator(chunk_size=options['batch_size']),
+                             options['batch_size']):
+            rendered = {post.pk: (post.text_html, post.preview_html)
+                        for post in batch}
+            render_posts(batch)
+            batch = [post for post in batch if rendered[post.pk] != (
+                post.text_html, post.preview_html)]
+            now = timezone.now()
+            for post in batch:
+                #  новая дата изменения сбрасывает ETag страниц поста
+                post.updated = now
+                group_ids.add(post.group_id)
+            Post.objects.bulk_update(batch, FIELDS)
+            changed += len(batch)
+        if changed:
+            bump_group_posts(*group_ids)
+            clear_archive()
+        self.stdout.write(f'Обновлено постов: {changed}')
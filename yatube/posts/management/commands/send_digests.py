@@ -0,0 +1,24 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from posts.notifications import send_digests
+
+
+class Command(BaseCommand):
+    help = ('Отправляет подписчикам дайджесты новых постов. Запускается '
+            'по расписанию, например cron раз в несколько минут.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--window', type=int,
+                            default=settings.NOTIFICATION_WINDOW,
+                            help='Сколько секунд копить уведомления.')
+        parser.add_argument('--batch-size', type=int,
+                            default=settings.NOTIFICATION_BATCH_SIZE,
+                            help='Писем на одно SMTP-соединение.')
+
+    def handle(self, *args, **options):
+        sent = send_digests(timedelta(seconds=options['window']),
+                            options['batch_size'])
+        self.stdout.write(f'Отправлено писем: {sent}')
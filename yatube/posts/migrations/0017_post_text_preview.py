@@ -0,0 +1,42 @@
+# Generated by Django 2.2.16 on 2026-10-19 09:09
+
+from django.db import migrations, models
+from django.utils.text import Truncator
+
+PREVIEW_LETTERS = 500
+
+
+def fill_previews(apps, schema_editor):
+    """Заполняет начало текста для уже существующих постов."""
+    Post = apps.get_model('posts', 'Post')
+    posts = []
+    for post in Post.objects.only('id', 'text').iterator(chunk_size=500):
+        post.text_preview = Truncator(post.text).chars(PREVIEW_LETTERS)
+        post.text_truncated = post.text_preview != post.text
+        posts.append(post)
+        if len(posts) == 500:
+            Post.objects.bulk_update(
+                posts, ['text_preview', 'text_truncated'])
+            posts = []
+    Post.objects.bulk_update(posts, ['text_preview', 'text_truncated'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0016_trending'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='text_preview',
+            field=models.TextField(blank=True, editable=False, verbose_name='Начало текста'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='text_truncated',
+            field=models.BooleanField(default=False, editable=False, verbose_name='Текст сокращен'),
+        ),
+        migrations.RunPython(fill_previews, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 2.2.16 on 2026-10-19 09:10
+
+import re
+
+from django.conf import settings
+from django.db import migrations, models
+from django.utils.html import format_html, urlize
+from django.utils.text import normalize_newlines
+
+#  копия правил posts.formatting на момент миграции
+MENTION_RE = re.compile(r'(?<![\w/.@])@(\w(?:[\w.+-]*\w)?)')
+
+ANCHOR_RE = re.compile(r'(<a [^>]*>.*?</a>)', re.S)
+
+
+def render_text(text, usernames):
+    html = urlize(normalize_newlines(text), nofollow=True, autoescape=True)
+    parts = ANCHOR_RE.split(html)
+    for index in range(0, len(parts), 2):
+        parts[index] = MENTION_RE.sub(
+            lambda match: format_html('<a href="/profile/{}/">@{}</a>',
+                                      match.group(1), match.group(1))
+            if match.group(1) in usernames else match.group(0),
+            parts[index])
+    return ''.join(parts).replace('\n', '<br>')
+
+
+def render_batch(posts, User):
+    mentions = set()
+    for post in posts:
+        mentions.update(MENTION_RE.findall(post.text))
+    usernames = set(User.objects.filter(username__in=mentions).values_list(
+        'username', flat=True)) if mentions else set()
+    for post in posts:
+        post.text_html = render_text(post.text, usernames)
+        post.preview_html = render_text(post.text_preview, usernames)
+
+
+def fill_html(apps, schema_editor):
+    """Рендерит HTML текста уже существующих постов."""
+    Post = apps.get_model('posts', 'Post')
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    posts = []
+    for post in Post.objects.only('id', 'text', 'text_preview').iterator(
+            chunk_size=500):
+        posts.append(post)
+        if len(posts) == 500:
+            render_batch(posts, User)
+            Post.objects.bulk_update(posts, ['text_html', 'preview_html'])
+            posts = []
+    render_batch(posts, User)
+    Post.objects.bulk_update(posts, ['text_html', 'preview_html'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0017_post_text_preview'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='preview_html',
+            field=models.TextField(blank=True, editable=False, verbose_name='Начало текста в HTML'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='text_html',
+            field=models.TextField(blank=True, editable=False, verbose_name='Текст в HTML'),
+        ),
+        migrations.RunPython(fill_html, migrations.RunPython.noop),
+    ]
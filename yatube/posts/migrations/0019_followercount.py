@@ -0,0 +1,55 @@
+# Generated by Django 2.2.16 on 2026-10-19 09:19
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+import django.db.models.deletion
+
+BATCH_SIZE = 100
+
+
+def fill_counts(apps, schema_editor):
+    """Считает подписчиков авторов и дополняет ленты обычных авторов
+    постами, которые раньше не попадали в них при подписке.
+    """
+    Follow = apps.get_model('posts', 'Follow')
+    FollowerCount = apps.get_model('posts', 'FollowerCount')
+    Post = apps.get_model('posts', 'Post')
+    FeedEntry = apps.get_model('posts', 'FeedEntry')
+    counts = Follow.objects.order_by().values('author_id').annotate(
+        followers=Count('id'))
+    FollowerCount.objects.bulk_create(
+        [FollowerCount(**count) for count in counts], batch_size=BATCH_SIZE)
+    ordinary = FollowerCount.objects.filter(
+        followers__lt=settings.FEED_CELEBRITY_THRESHOLD).values('author_id')
+    for follow in Follow.objects.filter(author_id__in=ordinary).iterator():
+        posts = Post.objects.filter(author_id=follow.author_id).values_list(
+            'id', 'pub_date')
+        FeedEntry.objects.bulk_create(
+            [FeedEntry(user_id=follow.user_id, post_id=post_id,
+                       author_id=follow.author_id, pub_date=pub_date)
+             for post_id, pub_date in posts.iterator()],
+            batch_size=BATCH_SIZE, ignore_conflicts=True,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('posts', '0018_post_text_html'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FollowerCount',
+            fields=[
+                ('author', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='follower_count', serialize=False, to=settings.AUTH_USER_MODEL, verbose_name='Автор')),
+                ('followers', models.PositiveIntegerField(db_index=True, default=0, verbose_name='Подписчики')),
+            ],
+            options={
+                'verbose_name': 'Число подписчиков',
+            },
+        ),
+        migrations.RunPython(fill_counts, migrations.RunPython.noop),
+    ]
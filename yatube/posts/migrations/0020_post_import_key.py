@@ -0,0 +1,18 @@
+# Generated by Django 2.2.16 on 2026-10-19 09:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0019_followercount'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='import_key',
+            field=models.CharField(editable=False, max_length=32, null=True, unique=True, verbose_name='Ключ импорта'),
+        ),
+    ]
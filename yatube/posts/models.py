@@ -1,10 +1,16 @@
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.utils.text import Truncator
+
+from .formatting import render_posts
 
 User = get_user_model()
 
 MAX_LETTERS = 15
 
+#  сколько символов текста показывает карточка поста в списках
+PREVIEW_LETTERS = 500
+
 
 class Group(models.Model):
     """Содаем модель Group, наследник класса Model из пакета models.
@@ -36,8 +42,18 @@ class Post(models.Model):
 
     text = models.TextField(verbose_name='Пост',
                             help_text='Введите текст поста')
+    text_preview = models.TextField(blank=True, editable=False,
+                                    verbose_name='Начало текста')
+    text_truncated = models.BooleanField(default=False, editable=False,
+                                         verbose_name='Текст сокращен')
+    text_html = models.TextField(blank=True, editable=False,
+                                 verbose_name='Текст в HTML')
+    preview_html = models.TextField(blank=True, editable=False,
+                                    verbose_name='Начало текста в HTML')
     pub_date = models.DateTimeField(auto_now_add=True,
                                     verbose_name='Дата публикации')
+    updated = models.DateTimeField(auto_now=True,
+                                   verbose_name='Дата изменения')
     author = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -61,13 +77,44 @@ class Post(models.Model):
         blank=True,
     )
 
+    views = models.PositiveIntegerField(default=0, db_index=True,
+                                        verbose_name='Просмотры')
+
+    #  временный ключ строки при импорте на БД, где bulk_create
+    #  не возвращает id; после импорта очищается
+    import_key = models.CharField(max_length=32, null=True, unique=True,
+                                  editable=False, verbose_name='Ключ импорта')
+
     class Meta:
         ordering = ('-pub_date',)
+        indexes = [models.Index(fields=['-pub_date', '-id'])]
 
     def __str__(self):
         """Возравращает текст поста."""
         return self.text[:MAX_LETTERS]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Запоминает группу загруженного поста, чтобы при переносе
+        в другую группу сбросить кеш и старой.
+        """
+        post = super().from_db(db, field_names, values)
+        post.loaded_group_id = post.__dict__.get('group_id')
+        return post
+
+    def save(self, *args, **kwargs):
+        if 'text' not in self.get_deferred_fields():
+            self.make_preview()
+            render_posts([self])
+        super().save(*args, **kwargs)
+
+    def make_preview(self):
+        """Заполняет начало текста, которое выводит карточка поста,
+        чтобы спискам не нужно было загружать весь текст.
+        """
+        self.text_preview = Truncator(self.text).chars(PREVIEW_LETTERS)
+        self.text_truncated = self.text_preview != self.text
+
 
 class Comment(models.Model):
     """Содаем модель Comment, наследник класса Model из пакета models."""
@@ -99,6 +146,9 @@ class Follow(models.Model):
                              verbose_name='Подписчик')
     author = models.ForeignKey(User, on_delete=models.CASCADE,
                                related_name='following', verbose_name='Автор')
+    #  у подписок, созданных до появления поля, даты нет
+    created = models.DateTimeField(auto_now_add=True, null=True,
+                                   verbose_name='Дата подписки')
 
     class Meta:
         verbose_name = 'Подписка'
@@ -108,3 +158,122 @@ class Follow(models.Model):
 
     def __str__(self):
         return str(f'{self.user} подписался на {self.author}')
+
+
+class FollowerCount(models.Model):
+    """Число подписчиков автора.
+
+    Пересчитывается при подписке и отписке, чтобы публикация поста
+    и чтение ленты узнавали «знаменитостей» без COUNT по подпискам.
+    """
+    author = models.OneToOneField(User, on_delete=models.CASCADE,
+                                  primary_key=True,
+                                  related_name='follower_count',
+                                  verbose_name='Автор')
+    followers = models.PositiveIntegerField(default=0, db_index=True,
+                                            verbose_name='Подписчики')
+
+    class Meta:
+        verbose_name = 'Число подписчиков'
+
+    def __str__(self):
+        return str(f'{self.author_id}: {self.followers}')
+
+
+class FeedEntry(models.Model):
+    """Материализованная запись ленты подписок.
+
+    Создается при публикации поста для каждого подписчика автора,
+    если у автора меньше FEED_CELEBRITY_THRESHOLD подписчиков.
+    Поле author дублирует post.author, чтобы при чтении ленты
+    исключать записи «знаменитостей» без join с таблицей постов.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE,
+                             related_name='feed_entries',
+                             verbose_name='Подписчик')
+    post = models.ForeignKey(Post, on_delete=models.CASCADE,
+                             related_name='feed_entries',
+                             verbose_name='Пост')
+    author = models.ForeignKey(User, on_delete=models.CASCADE,
+                               related_name='+', verbose_name='Автор')
+    pub_date = models.DateTimeField(verbose_name='Дата публикации')
+
+    class Meta:
+        verbose_name = 'Запись ленты'
+        ordering = ('-pub_date',)
+        indexes = [models.Index(fields=('user', '-pub_date'),
+                                name='feed_user_pub_date_idx')]
+        constraints = [models.UniqueConstraint(fields=('user', 'post'),
+                                               name='unique_feed_entry')]
+
+    def __str__(self):
+        return str(f'{self.post_id} в ленте {self.user_id}')
+
+
+class Recommendation(models.Model):
+    """Рекомендация автора для подписки.
+
+    Таблица заполняется командой compute_recommendations.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE,
+                             related_name='recommendations',
+                             verbose_name='Пользователь')
+    author = models.ForeignKey(User, on_delete=models.CASCADE,
+                               related_name='+',
+                               verbose_name='Рекомендуемый автор')
+    score = models.FloatField(verbose_name='Вес рекомендации')
+
+    class Meta:
+        verbose_name = 'Рекомендация'
+        ordering = ('-score',)
+        indexes = [models.Index(fields=('user', '-score'),
+                                name='recommendation_user_score_idx')]
+        constraints = [models.UniqueConstraint(
+            fields=('user', 'author'), name='unique_recommendation')]
+
+    def __str__(self):
+        return str(f'{self.author} для {self.user}')
+
+
+class Notification(models.Model):
+    """Новый пост автора, о котором нужно сообщить подписчику.
+
+    Записи копятся и отправляются одним письмом-дайджестом
+    командой send_digests, после отправки удаляются.
+    """
+    recipient = models.ForeignKey(User, on_delete=models.CASCADE,
+                                  related_name='notifications',
+                                  verbose_name='Получатель')
+    post = models.ForeignKey(Post, on_delete=models.CASCADE,
+                             related_name='+', verbose_name='Пост')
+    created = models.DateTimeField(auto_now_add=True,
+                                   verbose_name='Дата создания')
+
+    class Meta:
+        verbose_name = 'Уведомление'
+        indexes = [models.Index(fields=('recipient', 'created'),
+                                name='notification_recipient_idx')]
+        constraints = [models.UniqueConstraint(
+            fields=('recipient', 'post'), name='unique_notification')]
+
+    def __str__(self):
+        return str(f'{self.post_id} для {self.recipient_id}')
+
+
+class TrendingPost(models.Model):
+    """Место поста в рейтинге популярного.
+
+    Таблица пересчитывается командой compute_trending целиком,
+    страница читает ее по индексу rank.
+    """
+    post = models.OneToOneField(Post, on_delete=models.CASCADE,
+                                related_name='+', verbose_name='Пост')
+    rank = models.PositiveIntegerField(unique=True, verbose_name='Место')
+    score = models.FloatField(verbose_name='Рейтинг')
+
+    class Meta:
+        verbose_name = 'Популярный пост'
+        ordering = ('rank',)
+
+    def __str__(self):
+        return str(f'{self.rank}. {self.post_id}')
@@ -0,0 +1,76 @@
+"""Уведомления подписчиков о новых постах письмами-дайджестами.
+
+Публикация поста только ставит задачу, которая создает записи
+Notification для подписчиков, читая Follow кусками. Письма собирает
+команда send_digests: все посты, накопившиеся для получателя за окно,
+идут одним письмом, а письма пачки — через одно SMTP-соединение.
+"""
+
+from itertools import groupby
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import Min
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from .models import Follow, Notification
+from .utils import chunked
+
+
+def queue_notifications(post):
+    """Создает уведомления о посте для подписчиков автора с email."""
+    followers = (Follow.objects.filter(author_id=post.author_id)
+                 .exclude(user__email='').order_by('pk')
+                 .values_list('user_id', flat=True)
+                 .iterator(chunk_size=settings.NOTIFICATION_CHUNK_SIZE))
+    for chunk in chunked(followers, settings.NOTIFICATION_CHUNK_SIZE):
+        Notification.objects.bulk_create(
+            [Notification(recipient_id=user_id, post=post)
+             for user_id in chunk],
+            ignore_conflicts=True,
+        )
+
+
+def due_recipients(window):
+    """id получателей, чье самое старое уведомление ждет дольше window."""
+    cutoff = timezone.now() - window
+    return (Notification.objects.values('recipient_id')
+            .annotate(oldest=Min('created')).filter(oldest__lte=cutoff)
+            .order_by('recipient_id')
+            .values_list('recipient_id', flat=True))
+
+
+def build_digest(recipient, posts):
+    body = render_to_string('posts/email/digest.txt', {
+        'recipient': recipient,
+        'posts': posts,
+        'site_url': settings.SITE_URL,
+    })
+    return EmailMessage(f'Новые записи: {len(posts)}', body,
+                        to=[recipient.email])
+
+
+def send_digests(window, batch_size):
+    """Отправляет дайджесты получателям, у которых истекло окно.
+
+    Возвращает число отправленных писем. Удаляются только уведомления,
+    попавшие в письма, поэтому пришедшие во время отправки дождутся
+    следующего запуска.
+    """
+    sent = 0
+    for recipients in chunked(list(due_recipients(window)), batch_size):
+        notifications = list(
+            Notification.objects.filter(recipient_id__in=recipients)
+            .select_related('recipient', 'post__author')
+            .order_by('recipient_id', '-post__pub_date'))
+        messages = [
+            build_digest(recipient, [item.post for item in items])
+            for recipient, items in groupby(
+                notifications, key=lambda item: item.recipient)
+        ]
+        connection = get_connection()
+        sent += connection.send_messages(messages) or 0
+        Notification.objects.filter(
+            pk__in=[item.pk for item in notifications]).delete()
+    return sent
@@ -0,0 +1,85 @@
+from collections import Counter, defaultdict
+from heapq import nlargest
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.functions import Mod
+
+from .models import Comment, Follow, Recommendation
+
+User = get_user_model()
+
+#  граф, загруженный процессом пула через init_worker
+worker_graph = None
+
+
+def load_graph():
+    """Загружает граф подписок и комментариев в компактные словари."""
+    follows = defaultdict(set)
+    for user_id, author_id in Follow.objects.values_list(
+            'user_id', 'author_id').iterator():
+        follows[user_id].add(author_id)
+
+    commenters = defaultdict(set)
+    commented = defaultdict(set)
+    post_authors = {}
+    for post_id, author_id, post_author_id in Comment.objects.filter(
+            post__isnull=False).values_list(
+            'post_id', 'author_id', 'post__author_id').iterator():
+        commenters[post_id].add(author_id)
+        commented[author_id].add(post_id)
+        post_authors[post_id] = post_author_id
+
+    return follows, commenters, commented, post_authors
+
+
+def recommend(user_id, graph, top_k):
+    """Считает top-K авторов для пользователя.
+
+    Кандидаты получают вес за каждую подписку подписок
+    и за каждое обсуждение, в котором пользователь участвовал вместе с ними.
+    """
+    follows, commenters, commented, post_authors = graph
+    scores = Counter()
+    for author_id in follows[user_id]:
+        for candidate in follows[author_id]:
+            scores[candidate] += settings.RECOMMENDATIONS_FOLLOW_WEIGHT
+    for post_id in commented[user_id]:
+        scores[post_authors[post_id]] += (
+            settings.RECOMMENDATIONS_COMMENT_WEIGHT)
+        for candidate in commenters[post_id]:
+            scores[candidate] += settings.RECOMMENDATIONS_COMMENT_WEIGHT
+
+    excluded = follows[user_id] | {user_id}
+    candidates = ((score, author_id) for author_id, score in scores.items()
+                  if author_id not in excluded)
+    return nlargest(top_k, candidates)
+
+
+def init_worker():
+    """Загружает граф один раз на процесс пула."""
+    global worker_graph
+    worker_graph = load_graph()
+
+
+def compute_shard(shard, shards, top_k, graph=None):
+    """Пересчитывает рекомендации пользователей одного шарда.
+
+    Шард — пользователи, у которых id % shards == shard, выбираются
+    в БД. Граф берется из graph, из загруженного init_worker
+    или загружается заново. Возвращает число сохраненных рекомендаций.
+    """
+    if graph is None:
+        graph = worker_graph or load_graph()
+    user_ids = list(User.objects.annotate(shard=Mod('id', shards)).filter(
+        shard=shard).values_list('id', flat=True))
+    recommendations = [
+        Recommendation(user_id=user_id, author_id=author_id, score=score)
+        for user_id in user_ids
+        for score, author_id in recommend(user_id, graph, top_k)
+    ]
+    with transaction.atomic():
+        Recommendation.objects.filter(user_id__in=user_ids).delete()
+        Recommendation.objects.bulk_create(recommendations, batch_size=500)
+    return len(recommendations)
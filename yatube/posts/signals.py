@@ -0,0 +1,88 @@
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .archive import invalidate_post
+from .conditional import bump_authors
+from .feed import change_follower_count, drop_follow
+from .groups import bump_group_posts, bump_groups
+from .models import Follow, Group, Post, User
+from .tasks import backfill, fan_out, materialize_author, notify_followers
+
+
+@receiver(post_save, sender=Post)
+def post_created(sender, instance, created, **kwargs):
+    """Ставит в очередь раскладку нового поста по лентам подписчиков
+    и уведомления подписчиков.
+    """
+    if not created:
+        return
+    if settings.FEED_MODE == 'hybrid':
+        fan_out.delay(post_id=instance.pk)
+    notify_followers.delay(post_id=instance.pk)
+
+
+@receiver(post_save, sender=Follow)
+def follow_created(sender, instance, created, **kwargs):
+    """Обновляет число подписчиков автора и ставит в очередь заполнение
+    ленты его постами.
+    """
+    if not created:
+        return
+    change_follower_count(instance.author_id, 1)
+    if settings.FEED_MODE == 'hybrid':
+        backfill.delay(follow_id=instance.pk)
+
+
+@receiver(post_delete, sender=Follow)
+def follow_deleted(sender, instance, **kwargs):
+    """Очищает ленту от постов автора при отписке. Если автор перестал
+    быть «знаменитостью», его посты раскладываются по лентам
+    оставшихся подписчиков.
+    """
+    drop_follow(instance)
+    old, new = change_follower_count(instance.author_id, -1)
+    threshold = settings.FEED_CELEBRITY_THRESHOLD
+    if settings.FEED_MODE == 'hybrid' and old >= threshold > new:
+        materialize_author.delay(author_id=instance.author_id)
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def group_changed(sender, instance, **kwargs):
+    """Сбрасывает кеш групп во всех процессах."""
+    bump_groups()
+    bump_group_posts(instance.pk)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def post_changed(sender, instance, **kwargs):
+    """Сбрасывает кешированные страницы групп поста."""
+    bump_group_posts(instance.group_id,
+                     getattr(instance, 'loaded_group_id', None))
+    instance.loaded_group_id = instance.group_id
+
+
+@receiver(post_save, sender=Post)
+def post_edited(sender, instance, created, **kwargs):
+    """Сбрасывает снимок архивной страницы с отредактированным постом."""
+    if not created:
+        invalidate_post(instance)
+
+
+@receiver(post_delete, sender=Post)
+def post_deleted(sender, instance, **kwargs):
+    """Сбрасывает снимки страниц архива, которые сдвинул удаленный пост."""
+    invalidate_post(instance, deleted=True)
+
+
+@receiver(post_save, sender=User)
+def user_changed(sender, instance, created, update_fields, **kwargs):
+    """Меняет ETag страниц после изменения имени пользователя.
+    Вход обновляет только last_login и, при смене хешера, password.
+    """
+    if created or (update_fields
+                   and set(update_fields) <= {'last_login', 'password'}):
+        return
+    bump_authors()
@@ -0,0 +1,37 @@
+"""Фоновые задачи приложения posts, выполняются брокером TASK_BROKER."""
+
+from tasks.registry import task
+
+from .feed import backfill_follow, fan_out_post, materialize_followers
+from .models import Follow, Post
+from .notifications import queue_notifications
+
+
+@task
+def fan_out(post_id):
+    """Раскладывает пост по лентам подписчиков."""
+    post = Post.objects.filter(pk=post_id).first()
+    if post is not None:
+        fan_out_post(post)
+
+
+@task
+def backfill(follow_id):
+    """Заполняет ленту постами автора после подписки."""
+    follow = Follow.objects.filter(pk=follow_id).first()
+    if follow is not None:
+        backfill_follow(follow)
+
+
+@task
+def materialize_author(author_id):
+    """Раскладывает посты бывшей «знаменитости» по лентам подписчиков."""
+    materialize_followers(author_id)
+
+
+@task
+def notify_followers(post_id):
+    """Создает уведомления подписчиков о новом посте."""
+    post = Post.objects.filter(pk=post_id).first()
+    if post is not None:
+        queue_notifications(post)
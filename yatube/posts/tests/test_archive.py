@@ -0,0 +1,109 @@
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from ..archive import SITE_SCOPE, snapshot_path
+from ..models import Post
+
+User = get_user_model()
+
+TEMP_ARCHIVE_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(ARCHIVE_ROOT=TEMP_ARCHIVE_ROOT, ARCHIVE_AFTER_DAYS=30)
+class ArchiveTest(TestCase):
+    """Тестируем снимки архивных страниц."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='Irina')
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_ARCHIVE_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        shutil.rmtree(TEMP_ARCHIVE_ROOT, ignore_errors=True)
+        old = timezone.now() - timedelta(days=100)
+        self.posts = []
+        for number in range(25):
+            post = Post.objects.create(author=self.author,
+                                       text=f'Старый пост {number}')
+            Post.objects.filter(pk=post.pk).update(
+                pub_date=old + timedelta(hours=number))
+            self.posts.append(post)
+
+    def page(self, number):
+        return self.client.get(reverse('posts:archive', args=[number]))
+
+    def test_old_full_page_is_served_from_snapshot(self):
+        """Полная старая страница сохраняется и отдается без запросов,
+        когда следующая страница тоже в снимке.
+        """
+        first = self.page(1)
+        self.page(2)
+
+        self.assertContains(first, 'Старый пост 0')
+        self.assertNotContains(first, 'Старый пост 10')
+        self.assertTrue(os.path.exists(snapshot_path(SITE_SCOPE, 1)))
+
+        with self.assertNumQueries(0):
+            second = self.page(1)
+
+        self.assertEqual(first.content, second.content)
+
+    def test_incomplete_and_missing_pages(self):
+        """Неполная страница не сохраняется, пустая отдает 404."""
+        self.assertContains(self.page(3), 'Старый пост 24')
+        self.assertFalse(os.path.exists(snapshot_path(SITE_SCOPE, 3)))
+        self.assertEqual(self.page(4).status_code, 404)
+        self.assertEqual(self.page(0).status_code, 404)
+        self.assertEqual(self.client.get(reverse(
+            'posts:profile_archive', args=[self.author.username, 0])
+        ).status_code, 404)
+
+    def test_newer_link_only_before_last_page(self):
+        """Ссылка на более новые посты есть, пока за страницей есть посты."""
+        newer = 'Более новые'
+
+        self.assertContains(self.page(2), newer)
+        self.assertNotContains(self.page(3), newer)
+
+    def test_edit_drops_snapshot(self):
+        """Правка поста сбрасывает снимок его страницы."""
+        self.page(1)
+        post = Post.objects.get(pk=self.posts[3].pk)
+        post.text = 'Исправленный пост'
+        post.save()
+
+        self.assertFalse(os.path.exists(snapshot_path(SITE_SCOPE, 1)))
+        self.assertContains(self.page(1), 'Исправленный пост')
+
+    def test_delete_drops_following_snapshots(self):
+        """Удаление поста сбрасывает его страницу и все следующие."""
+        self.page(1)
+        self.page(2)
+        Post.objects.get(pk=self.posts[5].pk).delete()
+
+        self.assertFalse(os.path.exists(snapshot_path(SITE_SCOPE, 1)))
+        self.assertFalse(os.path.exists(snapshot_path(SITE_SCOPE, 2)))
+        self.assertContains(self.page(1), 'Старый пост 10')
+
+    def test_profile_archive(self):
+        """Архив автора показывает только его посты."""
+        other = User.objects.create_user(username='Marina')
+        Post.objects.create(author=other, text='Чужой пост')
+
+        response = self.client.get(reverse(
+            'posts:profile_archive', args=[self.author.username, 3]))
+
+        self.assertContains(response, 'Старый пост 24')
+        self.assertNotContains(response, 'Чужой пост')
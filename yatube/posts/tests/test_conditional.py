@@ -0,0 +1,103 @@
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..models import Comment, Group, Post
+
+User = get_user_model()
+
+
+class ConditionalGetTest(TestCase):
+    """Тестируем ответы 304 Not Modified по ETag."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='Marina')
+        cls.group = Group.objects.create(title='Тестовая группа',
+                                         slug='test-slug',
+                                         description='Описание')
+        cls.post = Post.objects.create(author=cls.user, group=cls.group,
+                                       text='Тестовый пост')
+
+    def setUp(self):
+        self.guest_client = Client()
+        self.pages = [
+            reverse('posts:group_list', kwargs={'slug': 'test-slug'}),
+            reverse('posts:profile', kwargs={'username': 'Marina'}),
+            reverse('posts:post_detail', kwargs={'post_id': self.post.id}),
+        ]
+
+    def test_unchanged_page_returns_not_modified(self):
+        """Повторный запрос с полученным ETag возвращает 304 без тела."""
+        for address in self.pages:
+            with self.subTest(address=address):
+                response = self.guest_client.get(address)
+                self.assertNotIn('Last-Modified', response)
+
+                repeated = self.guest_client.get(
+                    address, HTTP_IF_NONE_MATCH=response['ETag'])
+
+                self.assertEqual(repeated.status_code, 304)
+                self.assertEqual(repeated.content, b'')
+
+    def test_edit_changes_etag(self):
+        """После изменения поста страницы отдаются заново."""
+        etags = {address: self.guest_client.get(address)['ETag']
+                 for address in self.pages}
+        self.post.text = 'Исправленный пост'
+        self.post.save()
+
+        for address, etag in etags.items():
+            with self.subTest(address=address):
+                response = self.guest_client.get(
+                    address, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 200)
+
+    def assert_changed(self, etags):
+        for address, etag in etags.items():
+            with self.subTest(address=address):
+                response = self.guest_client.get(
+                    address, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 200)
+
+    def test_renames_change_etag(self):
+        """Переименование группы или автора меняет ETag страниц,
+        на которых выводятся их названия.
+        """
+        etags = {address: self.guest_client.get(address)['ETag']
+                 for address in self.pages}
+        self.group.title = 'Новое название'
+        self.group.save()
+
+        self.assert_changed(etags)
+
+        etags = {address: self.guest_client.get(address)['ETag']
+                 for address in self.pages}
+        self.user.first_name = 'Марина'
+        self.user.save()
+
+        self.assert_changed(etags)
+
+    def test_deleting_newest_comment_changes_etag(self):
+        """Удаление последнего комментария меняет ETag поста."""
+        Comment.objects.create(post=self.post, author=self.user,
+                               text='Первый')
+        newest = Comment.objects.create(post=self.post, author=self.user,
+                                        text='Второй')
+        address = self.pages[2]
+        etag = self.guest_client.get(address)['ETag']
+        newest.delete()
+
+        self.assert_changed({address: etag})
+
+    def test_etag_depends_on_viewer(self):
+        """Авторизованный пользователь получает свой ETag."""
+        authorized_client = Client()
+        authorized_client.force_login(self.user)
+        address = self.pages[1]
+
+        guest = self.guest_client.get(address)
+        authorized = authorized_client.get(address)
+
+        self.assertNotEqual(guest['ETag'], authorized['ETag'])
@@ -0,0 +1,95 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import DatabaseError
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from ..counters import flush_views
+from ..models import Post
+
+User = get_user_model()
+
+
+@override_settings(VIEW_FLUSH_SECONDS=None)
+class ViewCounterTest(TestCase):
+    """Тестируем буферизованный счетчик просмотров."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        author = User.objects.create_user(username='Irina')
+        cls.posts = [Post.objects.create(author=author, text=f'Пост {number}')
+                     for number in range(2)]
+
+    def setUp(self):
+        # Буфер процесса мог остаться от других тестов.
+        flush_views()
+        Post.objects.update(views=0)
+
+    def view(self, post, times=1):
+        for _ in range(times):
+            response = self.client.get(
+                reverse('posts:post_view', kwargs={'post_id': post.id}))
+        return response
+
+    def test_views_are_buffered_and_flushed_in_one_query(self):
+        """Просмотры копятся в памяти и записываются одним запросом."""
+        first, second = self.posts
+        response = self.view(first, 3)
+        self.view(second, 2)
+
+        self.assertEqual(response['Content-Type'], 'image/gif')
+        self.assertEqual(
+            list(Post.objects.order_by('pk').values_list('views', flat=True)),
+            [0, 0])
+
+        with self.assertNumQueries(1):
+            flush_views()
+
+        self.assertEqual(
+            list(Post.objects.order_by('pk').values_list('views', flat=True)),
+            [3, 2])
+        self.assertEqual(
+            list(Post.objects.order_by('-views')), [first, second])
+
+    @override_settings(VIEW_FLUSH_SIZE=2)
+    def test_buffer_is_flushed_when_full(self):
+        """Заполненный буфер сбрасывается во время запроса."""
+        post = self.posts[0]
+        self.view(post, 2)
+
+        post.refresh_from_db()
+        self.assertEqual(post.views, 2)
+
+    def test_flush_keeps_updated_date(self):
+        """Сброс просмотров не меняет дату изменения поста и его ETag."""
+        post = self.posts[0]
+        self.view(post)
+        flush_views()
+
+        self.assertEqual(Post.objects.get(pk=post.pk).updated, post.updated)
+
+    def test_page_embeds_beacon(self):
+        """Страница поста подгружает маячок, который не кешируется."""
+        post = self.posts[0]
+        beacon = reverse('posts:post_view', kwargs={'post_id': post.id})
+        response = self.client.get(
+            reverse('posts:post_detail', kwargs={'post_id': post.id}))
+
+        self.assertContains(response, f'src="{beacon}"')
+        self.assertIn('no-cache', self.view(post)['Cache-Control'])
+
+    def test_failed_flush_keeps_views(self):
+        """Ошибка БД при сбросе не теряет просмотры и не ломает запрос."""
+        post = self.posts[0]
+        self.view(post, 2)
+        with mock.patch('django.db.models.query.QuerySet.update',
+                        side_effect=DatabaseError):
+            with self.assertLogs('posts.counters', 'ERROR'):
+                self.assertEqual(flush_views(), 0)
+
+        flush_views()
+
+        post.refresh_from_db()
+        self.assertEqual(post.views, 2)
@@ -0,0 +1,113 @@
+import csv
+import gzip
+import io
+import json
+import os
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+
+from ..export import export_queryset, iterate_rows
+from ..models import Comment, Follow, Post
+
+User = get_user_model()
+
+
+class ExportTest(TestCase):
+    """Тестируем потоковую выгрузку данных."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='pass')
+        cls.author = User.objects.create_user(username='Irina')
+        cls.posts = [Post.objects.create(author=cls.author,
+                                         text=f'Пост {number}')
+                     for number in range(5)]
+        Comment.objects.create(post=cls.posts[0], author=cls.admin,
+                               text='Комментарий')
+        Follow.objects.create(user=cls.admin, author=cls.author)
+
+    def export(self, *args, **options):
+        out = io.StringIO()
+        call_command('export_data', *args, stdout=out, **options)
+        return out.getvalue()
+
+    def test_ndjson_export_with_after_id(self):
+        """NDJSON по строке на пост, --after-id выгружает только новые."""
+        rows = [json.loads(line)
+                for line in self.export('posts').splitlines()]
+
+        self.assertEqual([row['id'] for row in rows],
+                         [post.id for post in self.posts])
+        self.assertEqual(rows[0]['text'], 'Пост 0')
+
+        rows = self.export('posts', after_id=self.posts[2].id).splitlines()
+
+        self.assertEqual(len(rows), 2)
+
+    def test_csv_gzip_export_to_file(self):
+        """CSV выгружается в gzip-файл с заголовком."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'comments.csv.gz')
+            self.export('comments', format='csv', output=path)
+            with gzip.open(path, 'rt', encoding='utf-8') as export:
+                rows = list(csv.DictReader(export))
+
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['text'], 'Комментарий')
+
+    def test_since_filters_by_date(self):
+        """--since отбирает посты не раньше даты."""
+        since = self.posts[3].pub_date.isoformat()
+
+        self.assertEqual(len(self.export('posts', since=since)
+                             .splitlines()), 2)
+
+    def test_batches_by_id_without_server_side_cursors(self):
+        """Без серверных курсоров строки читаются пачками по id."""
+        original = connection.settings_dict.get(
+            'DISABLE_SERVER_SIDE_CURSORS', False)
+        connection.settings_dict['DISABLE_SERVER_SIDE_CURSORS'] = True
+        try:
+            with self.assertNumQueries(3):
+                rows = list(iterate_rows(export_queryset('posts'), ('id',),
+                                         chunk_size=2))
+        finally:
+            connection.settings_dict['DISABLE_SERVER_SIDE_CURSORS'] = (
+                original)
+
+        self.assertEqual([row['id'] for row in rows],
+                         [post.id for post in self.posts])
+
+    def test_admin_action_streams_export(self):
+        """Действие админки отдает выбранные подписки потоком."""
+        self.client.force_login(self.admin)
+
+        response = self.client.post(
+            reverse('admin:posts_follow_changelist'),
+            {'action': 'export_csv',
+             '_selected_action': Follow.objects.values_list('pk', flat=True)})
+
+        self.assertTrue(response.streaming)
+        content = b''.join(response.streaming_content).decode()
+        self.assertEqual(len(content.splitlines()), 2)
+
+    def test_admin_action_streams_gzip(self):
+        """Действие админки с gzip отдает сжатую выгрузку постов."""
+        self.client.force_login(self.admin)
+
+        response = self.client.post(
+            reverse('admin:posts_post_changelist'),
+            {'action': 'export_ndjson_gzip',
+             '_selected_action': [post.pk for post in self.posts]})
+
+        self.assertIn('posts.ndjson.gz', response['Content-Disposition'])
+        content = gzip.decompress(b''.join(response.streaming_content))
+        self.assertEqual(len(content.decode().splitlines()),
+                         len(self.posts))
@@ -0,0 +1,139 @@
+import io
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from ..feed import HybridFeed
+from ..models import FeedEntry, Follow, FollowerCount, Post
+
+User = get_user_model()
+
+
+class HybridFeedTest(TestCase):
+    """Тестируем гибридную ленту подписок."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='Marina')
+        cls.author = User.objects.create_user(username='Irina')
+        cls.celebrity = User.objects.create_user(username='Star')
+
+    def setUp(self):
+        self.authorized_user = Client()
+        self.authorized_user.force_login(self.user)
+
+    def test_new_post_is_materialized_for_followers(self):
+        """Пост обычного автора раскладывается по лентам подписчиков."""
+        Follow.objects.create(user=self.user, author=self.author)
+        post = Post.objects.create(author=self.author, text='Тестовый пост')
+
+        self.assertTrue(
+            FeedEntry.objects.filter(user=self.user, post=post).exists())
+
+    def test_follow_backfills_and_unfollow_drops_entries(self):
+        """Подписка добавляет старые посты автора, отписка их убирает."""
+        Post.objects.create(author=self.author, text='Старый пост')
+        follow = Follow.objects.create(user=self.user, author=self.author)
+
+        self.assertEqual(FeedEntry.objects.filter(user=self.user).count(), 1)
+
+        follow.delete()
+
+        self.assertFalse(FeedEntry.objects.filter(user=self.user).exists())
+
+    @override_settings(FEED_CELEBRITY_THRESHOLD=1)
+    def test_celebrity_posts_are_pulled_and_merged(self):
+        """Посты «знаменитостей» не материализуются, но попадают в ленту
+        в порядке даты публикации.
+        """
+        Follow.objects.create(user=self.user, author=self.celebrity)
+        first = Post.objects.create(author=self.celebrity, text='Первый')
+        second = Post.objects.create(author=self.author, text='Второй')
+        FeedEntry.objects.create(user=self.user, post=second,
+                                 author=self.author, pub_date=second.pub_date)
+        third = Post.objects.create(author=self.celebrity, text='Третий')
+
+        self.assertFalse(
+            FeedEntry.objects.filter(author=self.celebrity).exists())
+
+        feed = HybridFeed(self.user)
+
+        self.assertEqual(feed.count(), 3)
+        self.assertEqual(feed[0:3], [third, second, first])
+        self.assertEqual(feed[1:2], [second])
+
+    def test_follow_index_uses_hybrid_feed(self):
+        """Страница подписок показывает посты из гибридной ленты."""
+        Follow.objects.create(user=self.user, author=self.author)
+        post = Post.objects.create(author=self.author, text='Тестовый пост')
+
+        response = self.authorized_user.get(reverse('posts:follow_index'))
+
+        self.assertEqual(list(response.context['page_obj']), [post])
+
+    @override_settings(FEED_BACKFILL_SIZE=2)
+    def test_follow_backfills_all_posts(self):
+        """При подписке в ленту попадают все посты автора,
+        а не только последние FEED_BACKFILL_SIZE.
+        """
+        for number in range(5):
+            Post.objects.create(author=self.author, text=f'Пост {number}')
+        Follow.objects.create(user=self.user, author=self.author)
+
+        self.assertEqual(FeedEntry.objects.filter(user=self.user).count(), 5)
+
+    @override_settings(FEED_CELEBRITY_THRESHOLD=2)
+    def test_follower_count_tracks_celebrities(self):
+        """Число подписчиков хранится у автора и обновляется при
+        подписке и отписке, лента читает «знаменитостей» из него.
+        """
+        Follow.objects.create(user=self.user, author=self.celebrity)
+        follow = Follow.objects.create(user=self.author,
+                                       author=self.celebrity)
+
+        self.assertEqual(
+            FollowerCount.objects.get(author=self.celebrity).followers, 2)
+        self.assertEqual(HybridFeed(self.user).celebrities,
+                         [self.celebrity.pk])
+
+        follow.delete()
+
+        self.assertEqual(
+            FollowerCount.objects.get(author=self.celebrity).followers, 1)
+        self.assertEqual(HybridFeed(self.user).celebrities, [])
+
+    def test_recount_followers_after_bulk_follows(self):
+        """Команда пересчета восстанавливает счетчики после подписок,
+        созданных без сигналов.
+        """
+        Follow.objects.bulk_create([
+            Follow(user=self.user, author=self.celebrity),
+            Follow(user=self.author, author=self.celebrity),
+        ])
+
+        self.assertFalse(FollowerCount.objects.exists())
+
+        call_command('recount_followers', stdout=io.StringIO())
+
+        self.assertEqual(
+            FollowerCount.objects.get(author=self.celebrity).followers, 2)
+
+    @override_settings(FEED_CELEBRITY_THRESHOLD=2)
+    def test_former_celebrity_posts_are_materialized(self):
+        """Когда автор перестает быть «знаменитостью», его посты
+        раскладываются по лентам оставшихся подписчиков.
+        """
+        Follow.objects.create(user=self.user, author=self.celebrity)
+        follow = Follow.objects.create(user=self.author,
+                                       author=self.celebrity)
+        post = Post.objects.create(author=self.celebrity, text='Пост')
+
+        self.assertFalse(FeedEntry.objects.filter(post=post).exists())
+
+        follow.delete()
+
+        self.assertTrue(
+            FeedEntry.objects.filter(user=self.user, post=post).exists())
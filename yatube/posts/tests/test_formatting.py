@@ -0,0 +1,84 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from ..formatting import render_text
+from ..models import Post
+
+User = get_user_model()
+
+
+class PostFormattingTest(TestCase):
+    """Тестируем рендеринг текста поста в HTML."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='Irina')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_render_text(self):
+        """HTML экранируется, ссылки, почта и упоминания становятся
+        ссылками, переводы строк — <br>.
+        """
+        html = render_text(
+            '<b>Привет</b>, @Irina и @Nobody!\n'
+            'https://example.com/@Irina и me@example.com',
+            {'Irina'})
+
+        self.assertEqual(html, (
+            '&lt;b&gt;Привет&lt;/b&gt;, '
+            '<a href="/profile/Irina/">@Irina</a> и @Nobody!<br>'
+            '<a href="https://example.com/@Irina" rel="nofollow">'
+            'https://example.com/@Irina</a> и '
+            '<a href="mailto:me@example.com">me@example.com</a>'))
+
+    def test_mention_inside_link_is_not_linked(self):
+        """Упоминание внутри адреса ссылки не дает вложенной ссылки."""
+        html = render_text('https://example.com/?u=@Irina', {'Irina'})
+
+        self.assertEqual(html, (
+            '<a href="https://example.com/?u=%40Irina" rel="nofollow">'
+            'https://example.com/?u=@Irina</a>'))
+
+    def test_html_is_rendered_on_save_and_shown_in_pages(self):
+        """HTML считается при сохранении и выводится в карточке и на
+        странице поста.
+        """
+        post = Post.objects.create(author=self.author,
+                                   text='Читайте @Irina\n<script>')
+        expected = ('Читайте <a href="/profile/Irina/">@Irina</a>'
+                    '<br>&lt;script&gt;')
+
+        self.assertEqual(post.text_html, expected)
+        self.assertEqual(post.preview_html, expected)
+
+        addresses = (
+            reverse('posts:index'),
+            reverse('posts:post_detail', kwargs={'post_id': post.id}),
+        )
+        for address in addresses:
+            with self.subTest(address=address):
+                self.assertContains(self.client.get(address), expected)
+
+    def test_command_rerenders_changed_posts(self):
+        """Команда обновляет HTML, который изменился, например после
+        регистрации упомянутого пользователя.
+        """
+        post = Post.objects.create(author=self.author, text='Привет @Marina')
+        Post.objects.create(author=self.author, text='Другой пост')
+        User.objects.create_user(username='Marina')
+
+        out = StringIO()
+        call_command('render_posts', batch_size=1, stdout=out)
+
+        self.assertIn('Обновлено постов: 1', out.getvalue())
+        post.refresh_from_db()
+        self.assertIn('<a href="/profile/Marina/">@Marina</a>',
+                      post.text_html)
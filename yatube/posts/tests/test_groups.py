@@ -0,0 +1,100 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from ..groups import group_page_posts
+from ..models import Group, Post
+
+User = get_user_model()
+
+
+class GroupCacheTest(TestCase):
+    """Тестируем кеш групп и их первых страниц."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='Irina')
+        cls.group = Group.objects.create(title='Тестовая группа',
+                                         slug='test-slug',
+                                         description='Описание')
+        cls.other_group = Group.objects.create(title='Другая группа',
+                                               slug='other-slug',
+                                               description='Описание')
+
+    def setUp(self):
+        cache.clear()
+        self.post = Post.objects.create(author=self.author, group=self.group,
+                                        text='Тестовый пост')
+        self.address = reverse('posts:group_list',
+                               kwargs={'slug': self.group.slug})
+
+    def page_posts(self, slug):
+        response = self.client.get(
+            reverse('posts:group_list', kwargs={'slug': slug}))
+        return list(response.context['page_obj'])
+
+    def test_warm_group_page_uses_one_query(self):
+        """Повторный запрос страницы группы делает один запрос к БД —
+        проверку ETag, сама страница отдается из кеша страниц.
+        """
+        self.client.get(self.address)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.address)
+
+        self.assertContains(response, self.post.text)
+
+    def test_first_page_cache_uses_one_query(self):
+        """Повторное чтение первой страницы группы не обращается к БД."""
+        group_page_posts(self.group, None)
+
+        with self.assertNumQueries(0):
+            posts, count = group_page_posts(self.group, None)
+
+        self.assertEqual(list(posts), [self.post])
+        self.assertEqual(count, 1)
+
+    def test_post_changes_reset_group_pages(self):
+        """Новый пост и перенос поста сразу видны на страницах групп."""
+        self.page_posts('test-slug')
+        new_post = Post.objects.create(author=self.author, group=self.group,
+                                       text='Новый пост')
+
+        self.assertEqual(self.page_posts('test-slug'),
+                         [new_post, self.post])
+
+        self.page_posts('other-slug')
+        self.post.group = self.other_group
+        self.post.save()
+
+        self.assertEqual(self.page_posts('test-slug'), [new_post])
+        self.assertEqual(self.page_posts('other-slug'), [self.post])
+
+    def test_moving_loaded_post_resets_old_group(self):
+        """Перенос поста, загруженного из БД, сбрасывает и старую группу."""
+        self.page_posts('test-slug')
+        post = Post.objects.get(pk=self.post.pk)
+        post.group = self.other_group
+        post.save()
+
+        self.assertEqual(self.page_posts('test-slug'), [])
+
+    def test_author_rename_resets_first_page(self):
+        """Новое имя автора сразу видно на первой странице группы."""
+        self.client.get(self.address)
+        self.author.first_name = 'Ирина'
+        self.author.save()
+
+        self.assertContains(self.client.get(self.address), 'Ирина')
+
+    def test_group_edit_resets_group_cache(self):
+        """Изменение группы видно без перезапуска процесса."""
+        self.client.get(self.address)
+        self.group.title = 'Новое название'
+        self.group.save()
+
+        response = self.client.get(self.address)
+
+        self.assertEqual(response.context['group'].title, 'Новое название')
@@ -0,0 +1,121 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from ..models import FeedEntry, Follow, Group, Post
+
+User = get_user_model()
+
+TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+
+SMALL_GIF = (
+    b'\x47\x49\x46\x38\x39\x61\x02\x00'
+    b'\x01\x00\x80\x00\x00\x00\x00\x00'
+    b'\xFF\xFF\xFF\x21\xF9\x04\x00\x00'
+    b'\x00\x00\x00\x2C\x00\x00\x00\x00'
+    b'\x02\x00\x01\x00\x00\x02\x02\x0C'
+    b'\x0A\x00\x3B'
+)
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+class ImportPostsTest(TestCase):
+    """Тестируем массовый импорт постов."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.reader = User.objects.create_user(username='Marina')
+        cls.author = User.objects.create_user(username='Irina')
+        cls.group = Group.objects.create(title='Тестовая группа',
+                                         slug='test-slug',
+                                         description='Описание')
+        Follow.objects.create(user=cls.reader, author=cls.author)
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def import_rows(self, rows, **options):
+        path = os.path.join(self.directory, 'posts.ndjson')
+        with open(path, 'w', encoding='utf-8') as source:
+            for row in rows:
+                source.write(json.dumps(row, ensure_ascii=False) + '\n')
+        out = io.StringIO()
+        call_command('import_posts', path, stdout=out, **options)
+        return out.getvalue()
+
+    def test_import_in_batches_with_authors_and_groups(self):
+        """Посты вставляются пачками, строки с неизвестным автором
+        пропускаются, ленты подписчиков пополняются.
+        Запросы: словари авторов и групп, на пачку — транзакция
+        из вставки, поиска id по ключам и их очистки (с точкой сохранения
+        5 запросов) и пополнение лент (3 запроса).
+        """
+        rows = [{'text': f'Пост {number}', 'author': 'Irina',
+                 'group': 'test-slug'} for number in range(5)]
+        rows.append({'text': 'Чужой пост', 'author': 'Nobody'})
+
+        with self.assertNumQueries(2 + 3 * (5 + 3)):
+            report = self.import_rows(rows, batch_size=2)
+
+        self.assertIn('Импортировано 5 постов', report)
+        self.assertIn('пропущено 1', report)
+        self.assertEqual(self.group.posts.count(), 5)
+        self.assertEqual(FeedEntry.objects.filter(user=self.reader).count(),
+                         5)
+
+    def test_only_imported_posts_reach_feeds(self):
+        """В ленты попадают только импортированные посты, прежние посты
+        автора заново не раскладываются, ключи импорта очищаются.
+        """
+        old = Post.objects.create(author=self.author, text='Прежний пост')
+        FeedEntry.objects.filter(post=old).delete()
+
+        self.import_rows([{'text': 'Новый пост', 'author': 'Irina'}])
+
+        self.assertEqual(
+            list(FeedEntry.objects.values_list('post__text', flat=True)),
+            ['Новый пост'])
+        self.assertFalse(Post.objects.filter(
+            import_key__isnull=False).exists())
+
+    def test_keep_pub_date_and_create_missing(self):
+        """Дата публикации сохраняется, новые авторы создаются."""
+        self.import_rows(
+            [{'text': 'Старый пост', 'author': 'Newcomer',
+              'pub_date': '2015-06-01T12:00:00+00:00'}],
+            keep_pub_date=True, create_missing=True)
+
+        post = Post.objects.get(author__username='Newcomer')
+
+        self.assertEqual(post.pub_date.year, 2015)
+        self.assertFalse(post.author.has_usable_password())
+        self.assertTrue(Post._meta.get_field('pub_date').auto_now_add)
+
+    def test_images_are_copied(self):
+        """Картинки копируются в медиа и привязываются к постам."""
+        with open(os.path.join(self.directory, 'small.gif'), 'wb') as image:
+            image.write(SMALL_GIF)
+
+        self.import_rows(
+            [{'text': 'Пост с картинкой', 'author': 'Irina',
+              'image': 'small.gif'}],
+            images_dir=self.directory, image_workers=2)
+
+        post = Post.objects.get(text='Пост с картинкой')
+
+        self.assertEqual(post.image.name, 'posts/small.gif')
+        self.assertTrue(os.path.exists(post.image.path))
@@ -0,0 +1,79 @@
+import io
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase
+
+from .. import notifications
+from ..models import Follow, Notification, Post
+
+User = get_user_model()
+
+
+class DigestTest(TestCase):
+    """Тестируем дайджесты новых постов для подписчиков."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='Irina')
+        cls.readers = [
+            User.objects.create_user(username=f'reader{number}',
+                                     email=f'reader{number}@example.com')
+            for number in range(3)
+        ]
+        cls.silent = User.objects.create_user(username='silent')
+        for reader in cls.readers + [cls.silent]:
+            Follow.objects.create(user=reader, author=cls.author)
+
+    def send(self, window=0, **options):
+        out = io.StringIO()
+        call_command('send_digests', stdout=out, window=window, **options)
+        return out.getvalue()
+
+    def test_new_post_queues_notifications_for_followers_with_email(self):
+        """Новый пост создает уведомления подписчикам с email,
+        но писем сразу не отправляет.
+        """
+        Post.objects.create(author=self.author, text='Тестовый пост')
+
+        self.assertEqual(
+            set(Notification.objects.values_list('recipient', flat=True)),
+            {reader.pk for reader in self.readers})
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_posts_are_sent_as_one_digest_per_recipient(self):
+        """Посты за окно приходят одним письмом, уведомления удаляются."""
+        first = Post.objects.create(author=self.author, text='Первый пост')
+        second = Post.objects.create(author=self.author, text='Второй пост')
+
+        report = self.send()
+
+        self.assertIn('Отправлено писем: 3', report)
+        self.assertEqual(len(mail.outbox), 3)
+        body = mail.outbox[0].body
+        self.assertIn(first.text, body)
+        self.assertIn(second.text, body)
+        self.assertFalse(Notification.objects.exists())
+
+    def test_batch_uses_single_connection(self):
+        """Письма пачки отправляются через одно соединение."""
+        Post.objects.create(author=self.author, text='Тестовый пост')
+
+        with mock.patch.object(notifications, 'get_connection',
+                               wraps=notifications.get_connection) as opened:
+            self.send(batch_size=2)
+
+        self.assertEqual(opened.call_count, 2)
+        self.assertEqual(len(mail.outbox), 3)
+
+    def test_window_delays_digest(self):
+        """Уведомления моложе окна ждут следующего запуска."""
+        Post.objects.create(author=self.author, text='Тестовый пост')
+
+        self.send(window=3600)
+
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(Notification.objects.count(), 3)
@@ -0,0 +1,61 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from ..models import PREVIEW_LETTERS, Post
+
+User = get_user_model()
+
+
+class PostPreviewTest(TestCase):
+    """Тестируем начало текста в карточках постов."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='Irina')
+        cls.short_post = Post.objects.create(author=cls.author,
+                                             text='Короткий пост')
+        cls.long_post = Post.objects.create(
+            author=cls.author, text='Длинный пост. ' * PREVIEW_LETTERS)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_preview_is_stored_on_save(self):
+        """Короткий текст хранится целиком, длинный — обрезается."""
+        self.assertEqual(self.short_post.text_preview, 'Короткий пост')
+        self.assertFalse(self.short_post.text_truncated)
+        self.assertEqual(len(self.long_post.text_preview), PREVIEW_LETTERS)
+        self.assertTrue(self.long_post.text_truncated)
+
+        self.long_post.text = 'Исправленный пост'
+        self.long_post.save()
+
+        self.assertEqual(self.long_post.text_preview, 'Исправленный пост')
+        self.assertFalse(self.long_post.text_truncated)
+
+    def test_lists_do_not_load_full_text(self):
+        """Списки не загружают полный текст и лишние поля автора."""
+        addresses = (
+            reverse('posts:index'),
+            reverse('posts:profile', kwargs={'username': 'Irina'}),
+        )
+        for address in addresses:
+            with self.subTest(address=address):
+                response = self.client.get(address)
+                post = response.context['page_obj'][0]
+
+                self.assertIn('text', post.get_deferred_fields())
+                self.assertIn('password',
+                              post.author.get_deferred_fields())
+
+    def test_long_post_card_links_to_full_text(self):
+        """Карточка длинного поста ведет на полный текст."""
+        response = self.client.get(reverse('posts:index'))
+
+        self.assertContains(response, 'Читать далее', count=1)
+        self.assertContains(response, reverse(
+            'posts:post_detail', kwargs={'post_id': self.long_post.id}))
+        self.assertNotContains(response, self.long_post.text)
@@ -0,0 +1,77 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..models import Comment, Follow, Post, Recommendation
+from ..recommendations import load_graph
+
+User = get_user_model()
+
+
+class RecommendationTest(TestCase):
+    """Тестируем расчет и вывод рекомендаций авторов."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='Marina')
+        cls.friend = User.objects.create_user(username='Irina')
+        cls.author = User.objects.create_user(username='Tolstoy')
+        cls.commenter = User.objects.create_user(username='Critic')
+        Follow.objects.create(user=cls.user, author=cls.friend)
+        Follow.objects.create(user=cls.friend, author=cls.author)
+        post = Post.objects.create(author=cls.friend, text='Тестовый пост')
+        Comment.objects.create(post=post, author=cls.user, text='Согласна')
+        Comment.objects.create(post=post, author=cls.commenter, text='Нет')
+
+    def setUp(self):
+        self.authorized_user = Client()
+        self.authorized_user.force_login(self.user)
+
+    def test_command_stores_follow_and_comment_recommendations(self):
+        """Команда рекомендует подписки подписок и соседей по обсуждению,
+        исключая самого пользователя и уже отслеживаемых авторов.
+        """
+        call_command('compute_recommendations', shards=2, verbosity=0)
+
+        authors = set(Recommendation.objects.filter(
+            user=self.user).values_list('author__username', flat=True))
+
+        self.assertEqual(authors, {'Tolstoy', 'Critic'})
+
+    def test_graph_is_loaded_once_for_all_shards(self):
+        """Без пула процессов граф загружается один раз на все шарды."""
+        with mock.patch(
+                'posts.management.commands.compute_recommendations.'
+                'load_graph', wraps=load_graph) as loader:
+            call_command('compute_recommendations', shards=3, verbosity=0)
+
+        loader.assert_called_once()
+        self.assertTrue(
+            Recommendation.objects.filter(user=self.user).exists())
+
+    def test_follow_index_shows_recommendations(self):
+        """Блок рекомендаций выводится на странице подписок."""
+        Recommendation.objects.create(user=self.user, author=self.author,
+                                      score=1)
+
+        response = self.authorized_user.get(reverse('posts:follow_index'))
+
+        self.assertEqual(
+            [item.author for item in response.context['recommendations']],
+            [self.author])
+        self.assertContains(response, reverse(
+            'posts:profile_follow', kwargs={'username': 'Tolstoy'}))
+
+    def test_followed_author_is_not_recommended(self):
+        """Автор, на которого подписались, сразу пропадает из блока."""
+        Recommendation.objects.create(user=self.user, author=self.author,
+                                      score=1)
+        Follow.objects.create(user=self.user, author=self.author)
+
+        response = self.authorized_user.get(reverse('posts:follow_index'))
+
+        self.assertEqual(list(response.context['recommendations']), [])
@@ -0,0 +1,82 @@
+import io
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from ..models import Comment, Follow, Post, TrendingPost
+
+User = get_user_model()
+
+
+class TrendingTest(TestCase):
+    """Тестируем рейтинг популярных постов."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.reader = User.objects.create_user(username='Marina')
+        cls.author = User.objects.create_user(username='Irina')
+        cls.quiet = Post.objects.create(author=cls.author, text='Тихий пост')
+        cls.discussed = Post.objects.create(author=cls.author,
+                                            text='Обсуждаемый пост')
+        cls.old = Post.objects.create(author=cls.author, text='Старый пост')
+        for _ in range(3):
+            Comment.objects.create(post=cls.discussed, author=cls.reader,
+                                   text='Комментарий')
+            Comment.objects.create(post=cls.old, author=cls.reader,
+                                   text='Комментарий')
+        Post.objects.filter(pk=cls.old.pk).update(
+            pub_date=timezone.now() - timedelta(days=1))
+        Post.objects.filter(pk=cls.quiet.pk).update(views=1)
+
+    def test_scores_decay_with_age(self):
+        """Обсуждаемый свежий пост выше старого с той же активностью,
+        а пост без активности ниже всех.
+        """
+        call_command('compute_trending', stdout=io.StringIO())
+
+        self.assertEqual(
+            list(TrendingPost.objects.values_list('post', flat=True)),
+            [self.discussed.pk, self.old.pk, self.quiet.pk])
+
+    def test_new_followers_raise_author_posts(self):
+        """Новые подписчики автора поднимают его посты."""
+        author = User.objects.create_user(username='Star')
+        post = Post.objects.create(author=author, text='Пост звезды')
+        for number in range(30):
+            Follow.objects.create(
+                user=User.objects.create_user(username=f'fan{number}'),
+                author=author)
+
+        call_command('compute_trending', stdout=io.StringIO())
+
+        self.assertEqual(TrendingPost.objects.first().post, post)
+
+    def test_follows_without_date_are_not_new(self):
+        """Подписки, созданные до появления даты, не поднимают посты."""
+        author = User.objects.create_user(username='Star')
+        Post.objects.create(author=author, text='Пост звезды')
+        for number in range(30):
+            Follow.objects.create(
+                user=User.objects.create_user(username=f'fan{number}'),
+                author=author)
+        Follow.objects.filter(author=author).update(created=None)
+
+        call_command('compute_trending', stdout=io.StringIO())
+
+        self.assertEqual(TrendingPost.objects.first().post, self.discussed)
+
+    def test_trending_page_is_one_query(self):
+        """Страница читает рейтинг одним запросом."""
+        call_command('compute_trending', stdout=io.StringIO())
+        self.client.get(reverse('posts:trending'))
+
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('posts:trending'))
+
+        self.assertEqual(list(response.context['page_obj'])[0],
+                         self.discussed)
@@ -322,3 +322,34 @@ class FollowViewTest(TestCase):
         response = self.authorized_user.get(reverse('posts:follow_index'))
 
         self.assertEqual(len(response.context.get('page_obj').object_list), 0)
+
+
+class ViewQueriesTest(TestCase):
+    """Число запросов страниц не зависит от числа постов."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='Irina')
+        cls.group = Group.objects.create(title='Тестовая группа',
+                                         slug='test-slug',
+                                         description='Тестовое описание')
+        for number in range(POSTS_PER_PAGE):
+            cls.post = Post.objects.create(author=cls.author, group=cls.group,
+                                           text=f'Тестовый пост {number}')
+            Comment.objects.create(post=cls.post, author=cls.author,
+                                   text='Тестовый комментарий')
+
+    def test_pages_use_constant_number_of_queries(self):
+        """Автор, счетчики, группа и комментарии загружаются
+        без запроса на каждый пост. Первый запрос страницы — проверка ETag.
+        """
+        pages = {
+            reverse('posts:profile', kwargs={'username': self.author}): 3,
+            reverse('posts:group_list', kwargs={'slug': self.group.slug}): 4,
+            reverse('posts:post_detail', kwargs={'post_id': self.post.id}): 3,
+        }
+        for address, queries in pages.items():
+            with self.subTest(address=address):
+                with self.assertNumQueries(queries):
+                    self.client.get(address)
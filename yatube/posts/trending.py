@@ -0,0 +1,76 @@
+"""Рейтинг популярных постов.
+
+Оценка поста — взвешенная сумма свежих комментариев, просмотров
+и новых подписчиков автора, деленная на (возраст в часах + 2)
+в степени TRENDING_GRAVITY, как в рейтинге Hacker News: новые
+обсуждаемые посты поднимаются, старые постепенно уходят вниз.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import (DateTimeField, ExpressionWrapper, F,
+                              FloatField, Func, Value)
+from django.db.models.functions import Power
+from django.utils import timezone
+
+from .models import Comment, Follow, Post, TrendingPost
+from .utils import count_related
+
+
+class AgeHours(Func):
+    """Сколько часов прошло от даты expression до now.
+
+    Переносимой разницы дат в числах в Django нет, поэтому SQL свой:
+    EXTRACT(EPOCH ...) в PostgreSQL и julianday в SQLite.
+    """
+    template = '(EXTRACT(EPOCH FROM %(expressions)s) / 3600)'
+    arg_joiner = ' - '
+    output_field = FloatField()
+
+    def __init__(self, expression, now):
+        super().__init__(Value(now, output_field=DateTimeField()),
+                         expression)
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler, connection,
+            template='((julianday(%(expressions)s)) * 24)',
+            arg_joiner=') - julianday(', **extra_context)
+
+
+def trending_score(now):
+    """Выражение оценки поста, считается в БД."""
+    activity = (F('recent_comments') * settings.TRENDING_COMMENT_WEIGHT
+                + F('views') * settings.TRENDING_VIEW_WEIGHT
+                + F('new_followers') * settings.TRENDING_FOLLOWER_WEIGHT)
+    age = AgeHours('pub_date', now) + 2.0
+    return ExpressionWrapper(
+        activity / Power(age, settings.TRENDING_GRAVITY),
+        output_field=FloatField())
+
+
+def compute_trending():
+    """Пересчитывает таблицу TrendingPost, возвращает число постов в ней.
+
+    Учитываются посты за TRENDING_WINDOW_DAYS. Счетчики, оценка
+    и выбор TRENDING_SIZE лучших постов — один запрос с подзапросами,
+    в Python приходят только строки рейтинга. Подписки без даты
+    (созданные до ее появления) новыми не считаются.
+    """
+    now = timezone.now()
+    since = now - timedelta(days=settings.TRENDING_WINDOW_DAYS)
+    ranked = Post.objects.filter(pub_date__gte=since).annotate(
+        recent_comments=count_related(Comment, 'post', created__gte=since),
+        new_followers=count_related(Follow, 'author', 'author',
+                                    created__gte=since),
+    ).annotate(score=trending_score(now)).filter(score__gt=0).order_by(
+        '-score', '-id').values_list('id', 'score')[:settings.TRENDING_SIZE]
+    with transaction.atomic():
+        TrendingPost.objects.all().delete()
+        TrendingPost.objects.bulk_create(
+            TrendingPost(post_id=post_id, rank=rank, score=value)
+            for rank, (post_id, value) in enumerate(ranked, start=1)
+        )
+    return TrendingPost.objects.count()
@@ -1,11 +1,83 @@
 from django.core.paginator import Paginator
+from django.db.models import (BooleanField, Count, Exists, IntegerField,
+                              OuterRef, Subquery, Value)
+from django.db.models.functions import Coalesce
+
+from .models import Follow, Post
 
 POSTS_PER_PAGE = 10
 
+#  колонки поста и его связей, которые выводит карточка в списках
+CARD_FIELDS = (
+    'id', 'preview_html', 'text_truncated', 'pub_date', 'image',
+    'author__username', 'author__first_name', 'author__last_name',
+    'group__slug',
+)
+
 
-def make_paginator(request, posts):
+def make_paginator(request, posts, count=None):
+    """Возвращает страницу постов из GET-параметра page.
+
+    Если число постов уже известно (например, из аннотации),
+    его можно передать в count и не делать лишний COUNT-запрос.
+    """
     paginator = Paginator(posts, POSTS_PER_PAGE)
+    if count is not None:
+        paginator.count = count
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
 
     return page_obj
+
+
+def card_fields(prefix=''):
+    """Поля карточки поста, для связанной модели — с префиксом пути."""
+    return [prefix + name for name in CARD_FIELDS]
+
+
+def card_posts(posts):
+    """Загружает для постов только колонки, нужные карточке:
+    без полного текста и лишних полей автора и группы.
+    """
+    return posts.select_related('author', 'group').only(*CARD_FIELDS)
+
+
+def count_related(model, field, outer_field='pk', **filters):
+    """Подзапрос с числом объектов model, у которых field совпадает
+    с outer_field объекта внешнего запроса. Позволяет посчитать несколько
+    связей в одном запросе без перемножения строк join-ами.
+    filters дополнительно ограничивает считаемые объекты.
+    """
+    counts = (model.objects.filter(**{field: OuterRef(outer_field)},
+                                   **filters)
+              .order_by().values(field).annotate(count=Count('pk'))
+              .values('count'))
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+def profile_counters(viewer):
+    """Аннотации автора для страницы профиля: число постов, подписчиков,
+    подписок и флаг подписки текущего пользователя.
+    """
+    is_following = Value(False, output_field=BooleanField())
+    if viewer.is_authenticated:
+        is_following = Exists(Follow.objects.filter(
+            author=OuterRef('pk'), user=viewer))
+    return {
+        'posts_count': count_related(Post, 'author'),
+        'followers_count': count_related(Follow, 'author'),
+        'follows_count': count_related(Follow, 'user'),
+        'is_following': is_following,
+    }
+
+
+def chunked(items, size):
+    """Разбивает поток items на списки по size элементов."""
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
@@ -1,65 +1,155 @@
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
+from django.http import Http404, HttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
-from django.views.decorators.cache import cache_page
+from django.views.decorators.cache import never_cache
 
+from core.cache import edge_cache, stale_while_revalidate
+
+from .archive import (SITE_SCOPE, author_scope, get_archive_page,
+                      has_next_page)
+from .conditional import (conditional_page, group_state, post_state,
+                          profile_state)
+from .counters import record_view
+from .feed import get_follow_feed
 from .forms import CommentForm, PostForm
-from .models import Follow, Group, Post, User
-from .utils import make_paginator
+from .groups import get_group, group_page_posts
+from .models import Follow, Post, TrendingPost, User
+from .utils import (card_fields, card_posts, count_related, make_paginator,
+                    profile_counters)
 
 
-@cache_page(20, key_prefix='index_page')
+@edge_cache
+@stale_while_revalidate(20, key_prefix='index_page')
 def index(request):
     """Возравращает 10 постов на главной странице."""
-    posts = Post.objects.all()
+    posts = card_posts(Post.objects.all())
 
     context = {
         'page_obj': make_paginator(request, posts),
+        'index': True,
     }
 
     return render(request, 'posts/index.html', context)
 
 
+@edge_cache
+def trending(request):
+    """Популярные посты из таблицы, которую пересчитывает
+    compute_trending, — один запрос по индексу места.
+    """
+    ranked = TrendingPost.objects.select_related(
+        'post__author', 'post__group').only(
+        'post', *card_fields('post__'))[:settings.TRENDING_SIZE]
+    posts = [item.post for item in ranked]
+
+    context = {
+        'page_obj': make_paginator(request, posts, len(posts)),
+        'trending': True,
+    }
+
+    return render(request, 'posts/trending.html', context)
+
+
+@edge_cache
+@conditional_page(group_state)
+@stale_while_revalidate(20, key_prefix='group_page')
 def group_posts(request, slug):
-    """Возравращает 10 постов конкретной группы."""
-    group = get_object_or_404(Group, slug=slug)
-    posts = group.posts.all()
+    """Возравращает 10 постов конкретной группы.
+    Группа, первая страница и число постов берутся из кеша.
+    """
+    group = get_group(slug)
+    if group is None:
+        raise Http404
+    posts, count = group_page_posts(group, request.GET.get('page'))
 
     context = {
         'group': group,
-        'page_obj': make_paginator(request, posts),
+        'page_obj': make_paginator(request, posts, count),
     }
 
     return render(request, 'posts/group_list.html', context)
 
 
+@edge_cache
+@conditional_page(profile_state)
+@stale_while_revalidate(20, key_prefix='profile_page')
 def profile(request, username):
     """Будет отображаться информация об авторе и его посты.
     В following проверяем подписан ли текущий пользователь на автора,
     страницу которого он просматривает.
+    Счетчики и подписка считаются подзапросами в одном запросе к автору.
     """
-    author = get_object_or_404(User, username=username)
-    posts = author.posts.all()
-    following = (request.user.is_authenticated and author.following.filter(
-        user=request.user).exists())
+    author = get_object_or_404(
+        User.objects.annotate(**profile_counters(request.user)),
+        username=username,
+    )
+    posts = card_posts(author.posts.all())
 
     context = {
         'author': author,
-        'page_obj': make_paginator(request, posts),
-        'following': following,
+        'page_obj': make_paginator(request, posts, author.posts_count),
+        'following': bool(author.is_following),
     }
     return render(request, 'posts/profile.html', context)
 
 
+@edge_cache
+def archive(request, number):
+    """Архив всех постов от самых старых, страница number.
+    Старые страницы отдаются из готовых снимков.
+    """
+    snapshot = get_archive_page(SITE_SCOPE, number)
+    if snapshot is None:
+        raise Http404
+    context = {'snapshot': snapshot, 'number': number,
+               'has_next': has_next_page(SITE_SCOPE, number)}
+    return render(request, 'posts/archive.html', context)
+
+
+@edge_cache
+def profile_archive(request, username, number):
+    """Архив постов автора от самых старых, страница number."""
+    author = get_object_or_404(User, username=username)
+    scope = author_scope(author.pk)
+    snapshot = get_archive_page(scope, number)
+    if snapshot is None:
+        raise Http404
+    context = {'author': author, 'snapshot': snapshot, 'number': number,
+               'has_next': has_next_page(scope, number)}
+    return render(request, 'posts/archive.html', context)
+
+
+@edge_cache
+@conditional_page(post_state)
 def post_detail(request, post_id):
     """Страница для просмотра отдельного поста."""
-    post = get_object_or_404(Post, pk=post_id)
+    post = get_object_or_404(
+        Post.objects.select_related('author', 'group').annotate(
+            author_posts_count=count_related(Post, 'author', 'author')),
+        pk=post_id)
     form = CommentForm(request.POST or None)
-    comments = post.comments.all()
+    comments = post.comments.select_related('author')
     context = {'post': post, 'comments': comments, 'form': form}
 
     return render(request, 'posts/post_detail.html', context)
 
 
+#  прозрачная картинка 1x1 в формате GIF
+PIXEL = (b'GIF89a\x01\x00\x01\x00\x80\x00\x00\x00\x00\x00\xff\xff\xff'
+         b'!\xf9\x04\x01\x00\x00\x00\x00,\x00\x00\x00\x00\x01\x00'
+         b'\x01\x00\x00\x02\x02D\x01\x00;')
+
+
+@never_cache
+def post_view(request, post_id):
+    """Маячок просмотра поста: страница поста подгружает его картинкой,
+    поэтому просмотр учитывается, даже если страница пришла из кеша.
+    """
+    record_view(post_id)
+    return HttpResponse(PIXEL, content_type='image/gif')
+
+
 @login_required
 def post_create(request):
     """Страница для создания поста."""
@@ -116,9 +206,16 @@ def follow_index(request):
     """Страница с постами авторов, на которых подписан текущий пользователь.
     Информация о текущем пользователе доступна в переменной request.user.
     Following - ссылка на объект пользователя, на которого подписываются.
+    Источник постов зависит от FEED_MODE, см. posts.feed.
     """
-    followed_posts = Post.objects.filter(author__following__user=request.user)
-    context = {'page_obj': make_paginator(request, followed_posts)}
+    followed_posts = get_follow_feed(request.user)
+    #  рекомендации пересчитываются по расписанию, а подписка — сразу
+    recommendations = request.user.recommendations.exclude(
+        author__following__user=request.user).select_related(
+        'author')[:settings.RECOMMENDATIONS_TOP_K]
+    context = {'page_obj': make_paginator(request, followed_posts),
+               'recommendations': recommendations,
+               'follow': True}
 
     return render(request, 'posts/follow.html', context)
 
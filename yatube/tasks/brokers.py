@@ -0,0 +1,43 @@
+"""Брокеры очереди задач, выбираются настройкой TASK_BROKER."""
+
+import json
+from functools import lru_cache
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Task
+from .registry import get_task
+
+
+@lru_cache(maxsize=None)
+def load_broker(path):
+    return import_string(path)()
+
+
+def get_broker():
+    return load_broker(settings.TASK_BROKER)
+
+
+class ImmediateBroker:
+    """Выполняет задачу сразу в текущем потоке.
+
+    Для разработки и тестов: побочные эффекты видны сразу после запроса.
+    Ошибка задачи не прячется, а поднимается в вызывающий код.
+    """
+
+    def enqueue(self, name, kwargs):
+        get_task(name)(**json.loads(json.dumps(kwargs)))
+
+
+class DatabaseBroker:
+    """Кладет задачу в таблицу Task, ее выполняет команда run_tasks.
+
+    Запись создается в транзакции запроса: если запрос откатится,
+    задача не появится.
+    """
+
+    def enqueue(self, name, kwargs):
+        Task.objects.create(name=name, payload=json.dumps(kwargs),
+                            run_after=timezone.now())
@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from tasks.worker import make_pool, run_batch
+
+
+class Command(BaseCommand):
+    help = ('Выполняет задачи из очереди DatabaseBroker. Воркеров можно '
+            'запускать несколько, задачи между ними не дублируются.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4)
+        parser.add_argument('--pool', default='thread',
+                            choices=('thread', 'process'))
+        parser.add_argument('--batch-size', type=int, default=50)
+        parser.add_argument('--sleep', type=float, default=1.0,
+                            help='Пауза, когда очередь пуста, секунд.')
+        parser.add_argument('--once', action='store_true',
+                            help='Выполнить готовые задачи и выйти.')
+
+    def handle(self, *args, **options):
+        total = 0
+        with make_pool(options['pool'], options['workers']) as executor:
+            while True:
+                done = run_batch(options['batch_size'], executor)
+                total += done
+                if done:
+                    continue
+                if options['once']:
+                    break
+                time.sleep(options['sleep'])
+        self.stdout.write(f'Выполнено задач: {total}')
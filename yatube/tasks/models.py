@@ -0,0 +1,42 @@
+from django.db import models
+
+
+class Task(models.Model):
+    """Задача в очереди DatabaseBroker.
+
+    Аргументы хранятся в payload как JSON, поэтому в задачу можно
+    передавать только id и простые значения, но не пароли и объекты.
+    """
+    PENDING = 'pending'
+    RUNNING = 'running'
+    FAILED = 'failed'
+    STATUSES = (
+        (PENDING, 'Ожидает'),
+        (RUNNING, 'Выполняется'),
+        (FAILED, 'Ошибка'),
+    )
+
+    name = models.CharField(max_length=200, verbose_name='Задача')
+    payload = models.TextField(default='{}', verbose_name='Аргументы')
+    status = models.CharField(max_length=10, choices=STATUSES,
+                              default=PENDING, verbose_name='Статус')
+    attempts = models.PositiveIntegerField(default=0,
+                                           verbose_name='Попытки')
+    run_after = models.DateTimeField(verbose_name='Выполнить после')
+    claimed_by = models.CharField(max_length=32, blank=True,
+                                  verbose_name='Воркер')
+    claimed_at = models.DateTimeField(null=True, blank=True,
+                                      verbose_name='Взята в работу')
+    last_error = models.TextField(blank=True, verbose_name='Ошибка')
+    created = models.DateTimeField(auto_now_add=True,
+                                   verbose_name='Дата создания')
+
+    class Meta:
+        verbose_name = 'Задача'
+        verbose_name_plural = 'Задачи'
+        ordering = ('id',)
+        indexes = [models.Index(fields=('status', 'run_after'),
+                                name='task_status_run_after_idx')]
+
+    def __str__(self):
+        return f'{self.name} ({self.get_status_display()})'
@@ -0,0 +1,27 @@
+from functools import wraps
+
+_tasks = {}
+
+
+def task(func):
+    """Регистрирует функцию как фоновую задачу.
+
+    func.delay(**kwargs) ставит вызов в очередь брокера TASK_BROKER,
+    аргументы должны сериализоваться в JSON.
+    """
+    name = f'{func.__module__}.{func.__name__}'
+    _tasks[name] = func
+
+    @wraps(func)
+    def delay(**kwargs):
+        from .brokers import get_broker
+
+        get_broker().enqueue(name, kwargs)
+
+    func.task_name = name
+    func.delay = delay
+    return func
+
+
+def get_task(name):
+    return _tasks[name]
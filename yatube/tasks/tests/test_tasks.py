@@ -0,0 +1,156 @@
+import io
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from posts.models import FeedEntry, Follow, Post
+
+from ..models import Task
+from ..registry import task
+from ..worker import claim_batch, finish_batch, run_batch
+
+User = get_user_model()
+
+calls = []
+
+
+@task
+def record(value):
+    calls.append(value)
+
+
+@task
+def explode():
+    raise RuntimeError('Ошибка задачи')
+
+
+@override_settings(TASK_BROKER='tasks.brokers.DatabaseBroker',
+                   TASK_MAX_ATTEMPTS=2)
+class DatabaseBrokerTest(TestCase):
+    """Тестируем очередь задач в БД."""
+
+    def setUp(self):
+        calls.clear()
+
+    def test_post_fan_out_leaves_request_path(self):
+        """Раскладка поста по лентам выполняется воркером, а не при
+        сохранении поста.
+        """
+        reader = User.objects.create_user(username='Marina')
+        author = User.objects.create_user(username='Irina')
+        Follow.objects.create(user=reader, author=author)
+        run_batch(10)
+        post = Post.objects.create(author=author, text='Тестовый пост')
+
+        self.assertFalse(FeedEntry.objects.filter(post=post).exists())
+        self.assertTrue(Task.objects.filter(name='posts.tasks.fan_out')
+                        .exists())
+
+        run_batch(10)
+
+        self.assertTrue(FeedEntry.objects.filter(post=post).exists())
+        self.assertFalse(Task.objects.exists())
+
+    def test_tasks_are_claimed_once(self):
+        """Одна задача не попадает в две пачки."""
+        for value in range(3):
+            record.delay(value=value)
+
+        first, second = claim_batch(2), claim_batch(2)
+
+        self.assertEqual(len(first), 2)
+        self.assertEqual(len(second), 1)
+        self.assertFalse({task['id'] for task in first}
+                         & {task['id'] for task in second})
+
+    def test_failed_task_is_retried_then_marked_failed(self):
+        """Упавшая задача откладывается, после последней попытки
+        помечается ошибкой.
+        """
+        explode.delay()
+        run_batch(10)
+        failed = Task.objects.get()
+
+        self.assertEqual(failed.status, Task.PENDING)
+        self.assertEqual(failed.attempts, 1)
+        self.assertIn('Ошибка задачи', failed.last_error)
+        self.assertEqual(run_batch(10), 0)
+
+        Task.objects.update(run_after=failed.created)
+        run_batch(10)
+
+        self.assertEqual(Task.objects.get().status, Task.FAILED)
+
+    def test_stale_running_task_is_reclaimed(self):
+        """Задачу упавшего воркера забирают снова после TASK_LEASE_SECONDS,
+        а свежую — нет.
+        """
+        record.delay(value=1)
+        claimed = claim_batch(10)
+
+        self.assertEqual(claim_batch(10), [])
+
+        Task.objects.update(
+            claimed_at=timezone.now() - timedelta(
+                seconds=settings.TASK_LEASE_SECONDS + 1))
+        reclaimed = claim_batch(10)
+
+        self.assertEqual([task['id'] for task in reclaimed],
+                         [task['id'] for task in claimed])
+        self.assertEqual(reclaimed[0]['attempts'], 1)
+
+        finish_batch(claimed, [(claimed[0]['id'], None)])
+
+        self.assertTrue(Task.objects.exists())
+
+    def test_task_crashing_worker_is_failed_after_max_attempts(self):
+        """Задача, из-за которой воркер падает, после TASK_MAX_ATTEMPTS
+        просроченных захватов помечается ошибкой, а не берется снова.
+        """
+        record.delay(value=1)
+        expired = timezone.now() - timedelta(
+            seconds=settings.TASK_LEASE_SECONDS + 1)
+        claim_batch(10)
+        Task.objects.update(claimed_at=expired)
+
+        self.assertEqual(len(claim_batch(10)), 1)
+
+        Task.objects.update(claimed_at=expired)
+
+        self.assertEqual(claim_batch(10), [])
+
+        task = Task.objects.get()
+        self.assertEqual(task.status, Task.FAILED)
+        self.assertEqual(task.attempts, 2)
+
+
+class ImmediateBrokerTest(TestCase):
+    """Тестируем выполнение задач сразу в запросе."""
+
+    def test_task_error_is_raised(self):
+        """Ошибка задачи не проглатывается брокером."""
+        with self.assertRaisesMessage(RuntimeError, 'Ошибка задачи'):
+            explode.delay()
+
+
+@override_settings(TASK_BROKER='tasks.brokers.DatabaseBroker')
+class RunTasksCommandTest(TransactionTestCase):
+    """Тестируем команду воркера с пулом потоков."""
+
+    def test_worker_runs_tasks_in_batches(self):
+        """Воркер выполняет все задачи пачками и удаляет их."""
+        calls.clear()
+        for value in range(5):
+            record.delay(value=value)
+
+        out = io.StringIO()
+        call_command('run_tasks', once=True, batch_size=2, workers=2,
+                     stdout=out)
+
+        self.assertEqual(sorted(calls), list(range(5)))
+        self.assertIn('Выполнено задач: 5', out.getvalue())
+        self.assertFalse(Task.objects.exists())
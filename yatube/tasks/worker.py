@@ -0,0 +1,108 @@
+"""Выполнение задач из таблицы Task пачками в пуле потоков или процессов."""
+
+import json
+import traceback
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, connections
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Task
+from .registry import get_task
+
+
+LEASE_EXPIRED = 'Воркер не завершил задачу за TASK_LEASE_SECONDS.'
+
+
+def claim_batch(size):
+    """Забирает до size готовых задач так, чтобы их не взял другой воркер.
+
+    Задачи помечаются условным UPDATE по статусу, поэтому способ
+    работает и на SQLite, где нет SELECT ... FOR UPDATE SKIP LOCKED.
+    Задачи, которые дольше TASK_LEASE_SECONDS висят за упавшим воркером,
+    забираются снова, и это засчитывается как попытка; исчерпавшие
+    TASK_MAX_ATTEMPTS помечаются ошибкой.
+    """
+    token = uuid.uuid4().hex
+    now = timezone.now()
+    ready = Q(status=Task.PENDING, run_after__lte=now)
+    stale = Q(status=Task.RUNNING, claimed_at__lt=now - timedelta(
+        seconds=settings.TASK_LEASE_SECONDS))
+    Task.objects.filter(
+        stale, attempts__gte=settings.TASK_MAX_ATTEMPTS - 1).update(
+        status=Task.FAILED, attempts=F('attempts') + 1, claimed_by='',
+        claimed_at=None, last_error=LEASE_EXPIRED)
+    ids = list(Task.objects.filter(ready | stale)
+               .values_list('id', flat=True)[:size])
+    if not ids:
+        return []
+    claim = {'status': Task.RUNNING, 'claimed_by': token, 'claimed_at': now}
+    Task.objects.filter(ready, id__in=ids).update(**claim)
+    Task.objects.filter(stale, id__in=ids).update(
+        attempts=F('attempts') + 1, **claim)
+    return list(Task.objects.filter(claimed_by=token, status=Task.RUNNING)
+                .values('id', 'name', 'payload', 'attempts', 'claimed_by'))
+
+
+def execute(task):
+    """Выполняет задачу и возвращает (id, текст ошибки или None).
+
+    Соединение потока или процесса переиспользуется между задачами,
+    оборванное закрывается перед следующей, как между запросами.
+    """
+    if not connection.in_atomic_block:
+        connection.close_if_unusable_or_obsolete()
+    try:
+        get_task(task['name'])(**json.loads(task['payload']))
+    except Exception:
+        return task['id'], traceback.format_exc()
+    return task['id'], None
+
+
+def finish_batch(tasks, results):
+    """Удаляет выполненные задачи, упавшие откладывает с растущей
+    задержкой, а после TASK_MAX_ATTEMPTS попыток помечает ошибкой.
+
+    Задачи, которые за это время забрал другой воркер, не трогаются.
+    """
+    attempts = {task['id']: task['attempts'] for task in tasks}
+    token = tasks[0]['claimed_by']
+    done = [task_id for task_id, error in results if error is None]
+    Task.objects.filter(id__in=done, claimed_by=token).delete()
+    now = timezone.now()
+    for task_id, error in results:
+        if error is None:
+            continue
+        tries = attempts[task_id] + 1
+        if tries >= settings.TASK_MAX_ATTEMPTS:
+            changes = {'status': Task.FAILED}
+        else:
+            delay = settings.TASK_RETRY_DELAY * 2 ** (tries - 1)
+            changes = {'status': Task.PENDING,
+                       'run_after': now + timedelta(seconds=delay)}
+        Task.objects.filter(id=task_id, claimed_by=token).update(
+            attempts=tries, last_error=error, claimed_by='', claimed_at=None,
+            **changes)
+
+
+def make_pool(kind, workers):
+    if kind == 'process':
+        # Соединения с БД нельзя разделять между процессами.
+        connections.close_all()
+        return ProcessPoolExecutor(workers)
+    return ThreadPoolExecutor(workers, thread_name_prefix='task-worker')
+
+
+def run_batch(size, executor=None):
+    """Выполняет одну пачку задач в пуле или, без пула, в текущем потоке.
+    Возвращает число взятых задач.
+    """
+    tasks = claim_batch(size)
+    if tasks:
+        runner = executor.map if executor is not None else map
+        finish_batch(tasks, list(runner(execute, tasks)))
+    return len(tasks)
@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """Argon2 с параметрами из настроек ARGON2_*.
+
+    Требует пакет argon2-cffi. Алгоритм и формат хеша совпадают
+    со стандартным Argon2PasswordHasher, поэтому при изменении параметров
+    старые хеши продолжают проверяться и обновляются при входе.
+    """
+
+    @property
+    def time_cost(self):
+        return settings.ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self):
+        return settings.ARGON2_MEMORY_COST
+
+    @property
+    def parallelism(self):
+        return settings.ARGON2_PARALLELISM
@@ -0,0 +1,48 @@
+from unittest import skipUnless
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+try:
+    import argon2
+except ImportError:
+    argon2 = None
+
+User = get_user_model()
+
+ARGON2_HASHERS = settings.PASSWORD_HASHER_PROFILES['argon2']
+
+
+class PasswordHashingTest(TestCase):
+    """Тестируем выбор хешеров и обновление хеша после входа."""
+
+    def test_tests_use_fast_hasher(self):
+        """В тестах пароли хешируются быстрым хешером."""
+        user = User.objects.create_user(username='Marina', password='pass')
+
+        self.assertEqual(identify_hasher(user.password).algorithm, 'md5')
+
+    @skipUnless(argon2, 'нужен пакет argon2-cffi')
+    @override_settings(PASSWORD_HASHERS=ARGON2_HASHERS,
+                       ARGON2_MEMORY_COST=1024)
+    def test_login_upgrades_old_hash_and_keeps_session(self):
+        """После входа PBKDF2-хеш заменяется на Argon2,
+        а пользователь остается авторизованным.
+        """
+        user = User.objects.create(
+            username='Marina',
+            password=make_password('secret-pass', hasher='pbkdf2_sha256'))
+
+        response = self.client.post(
+            reverse('users:login'),
+            {'username': 'Marina', 'password': 'secret-pass'})
+        user.refresh_from_db()
+
+        self.assertRedirects(response, reverse('posts:index'))
+        self.assertEqual(identify_hasher(user.password).algorithm, 'argon2')
+        self.assertTrue(user.check_password('secret-pass'))
+        response = self.client.get(reverse('posts:follow_index'))
+        self.assertEqual(response.context['user'], user)
@@ -0,0 +1,38 @@
+"""Настройки проекта yatube.
+
+Профиль выбирается переменной окружения YATUBE_ENV: dev (по умолчанию),
+prod или bench. Значения, которые зависят от нескольких настроек профиля,
+вычисляются здесь, после его загрузки.
+"""
+
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+YATUBE_ENV = os.getenv('YATUBE_ENV', 'dev')
+
+if YATUBE_ENV == 'dev':
+    from .dev import *
+elif YATUBE_ENV == 'prod':
+    from .prod import *
+elif YATUBE_ENV == 'bench':
+    from .bench import *
+else:
+    raise ImproperlyConfigured(f'Неизвестный профиль YATUBE_ENV={YATUBE_ENV}')
+
+if TEMPLATE_CACHE:
+    TEMPLATES[0]['OPTIONS']['loaders'] = [
+        ('django.template.loaders.cached.Loader', TEMPLATE_LOADERS),
+    ]
+
+PASSWORD_HASHERS = PASSWORD_HASHER_PROFILES[PASSWORD_HASHER_PROFILE]
+
+#  LocMemCache у каждого процесса свой, а файловый кеш при переполнении
+#  стирает случайные записи, поэтому хранить в них одни только сессии
+#  нельзя — переключаемся на cached_db
+if (SESSION_STORAGE == 'cache'
+        and CACHES['default']['BACKEND'].endswith(
+            ('LocMemCache', 'FileBasedCache'))):
+    SESSION_STORAGE = 'cached_db'
+
+SESSION_ENGINE = SESSION_ENGINES[SESSION_STORAGE]
@@ -0,0 +1,418 @@
+"""
+Django settings for yatube project.
+
+Generated by 'django-admin startproject' using Django 2.2.19.
+
+Общие настройки всех профилей. Профили dev, prod и bench переопределяют
+их, а значения, зависящие от профиля, вычисляются в __init__.py.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/2.2/topics/settings/
+
+For the full list of settings and their values, see
+https://docs.djangoproject.com/en/2.2/ref/settings/
+"""
+
+import os
+import sys
+
+# Build paths inside the project like this: os.path.join(BASE_DIR, ...)
+BASE_DIR = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def env_bool(name, default):
+    """Читает булеву переменную окружения: 1/true/yes — True."""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.lower() in ('1', 'true', 'yes')
+
+
+def env_list(name, default):
+    """Читает список из переменной окружения, разделенный запятыми."""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+# Quick-start development settings - unsuitable for production
+# See https://docs.djangoproject.com/en/2.2/howto/deployment/checklist/
+
+# SECURITY WARNING: keep the secret key used in production secret!
+SECRET_KEY = os.getenv(
+    'SECRET_KEY', 'g)mzad3nx@g0ve=&mr4ee=r+p1c+=7=gvl87avr3*5prl*py=%')
+
+# SECURITY WARNING: don't run with debug turned on in production!
+DEBUG = False
+
+ALLOWED_HOSTS = env_list('ALLOWED_HOSTS', [
+    'localhost',
+    '127.0.0.1',
+    '[::1]',
+    'testserver',
+])
+
+
+# Application definition
+
+INSTALLED_APPS = [
+    'django.contrib.admin',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+    'core.apps.CoreConfig',
+    'posts.apps.PostsConfig',
+    'users.apps.UsersConfig',
+    'about.apps.AboutConfig',
+    'api.apps.ApiConfig',
+    'tasks.apps.TasksConfig',
+    'sorl.thumbnail',
+]
+
+MIDDLEWARE = [
+    'django.middleware.security.SecurityMiddleware',
+    'core.middleware.CompressionMiddleware',
+    'core.middleware.EdgeCacheMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.ReplicaRoutingMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+ROOT_URLCONF = 'yatube.urls'
+TEMPLATES_DIR = os.path.join(BASE_DIR, 'templates')
+
+#  кеширующий загрузчик шаблонов, переменная YATUBE_TEMPLATE_CACHE=1/0;
+#  список загрузчиков в TEMPLATES собирается в __init__.py
+TEMPLATE_CACHE = env_bool('YATUBE_TEMPLATE_CACHE', True)
+
+TEMPLATE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [TEMPLATES_DIR],
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.debug',
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+                'core.context_processors.year.year',
+            ],
+            'loaders': TEMPLATE_LOADERS,
+        },
+    },
+]
+
+WSGI_APPLICATION = 'yatube.wsgi.application'
+
+
+# Database
+# https://docs.djangoproject.com/en/2.2/ref/settings/#databases
+
+#  движок БД выбирается переменной DB_ENGINE: sqlite или postgresql.
+#  При работе PostgreSQL через pgbouncer в режиме transaction pooling
+#  нужно задать DB_POOLER=pgbouncer: серверные курсоры в нем не работают
+DB_ENGINE = os.getenv('DB_ENGINE', 'sqlite')
+
+if DB_ENGINE == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.getenv('POSTGRES_DB', 'yatube'),
+            'USER': os.getenv('POSTGRES_USER', 'yatube'),
+            'PASSWORD': os.getenv('POSTGRES_PASSWORD', ''),
+            'HOST': os.getenv('DB_HOST', 'localhost'),
+            'PORT': os.getenv('DB_PORT', '5432'),
+            'CONN_MAX_AGE': int(os.getenv('CONN_MAX_AGE', 0)),
+            'DISABLE_SERVER_SIDE_CURSORS': (
+                os.getenv('DB_POOLER') == 'pgbouncer'),
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.getenv('SQLITE_PATH',
+                              os.path.join(BASE_DIR, 'db.sqlite3')),
+            'CONN_MAX_AGE': int(os.getenv('CONN_MAX_AGE', 0)),
+            'OPTIONS': {
+                #  сколько секунд ждать снятия блокировки записи
+                'timeout': int(os.getenv('SQLITE_TIMEOUT', 20)),
+            },
+        }
+    }
+
+#  реплики для чтения: DB_REPLICAS — пути к файлам SQLite или хосты
+#  PostgreSQL через запятую. Каждая получает алиас replica_N и в тестах
+#  зеркалирует default
+DATABASE_REPLICAS = []
+for number, location in enumerate(env_list('DB_REPLICAS', [])):
+    alias = f'replica_{number}'
+    DATABASES[alias] = {
+        **DATABASES['default'],
+        'NAME' if DB_ENGINE == 'sqlite' else 'HOST': location,
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter']
+
+#  страницы, которые читают из реплик, и сколько секунд после записи
+#  запросы пользователя идут только в основную БД
+REPLICA_READ_VIEWS = {
+    'posts:index',
+    'posts:group_list',
+    'posts:profile',
+    'posts:post_detail',
+    'posts:follow_index',
+}
+REPLICA_PIN_SECONDS = int(os.getenv('DB_REPLICA_PIN_SECONDS', 5))
+
+#  PRAGMA для новых соединений с SQLite, см. core.sqlite; ожидание
+#  блокировки задает OPTIONS['timeout'] выше.
+#  WAL позволяет читать во время записи, NORMAL в режиме WAL не теряет
+#  целостность при сбое процесса; cache_size отрицательный — размер в КиБ
+SQLITE_PRAGMAS = {
+    'journal_mode': os.getenv('SQLITE_JOURNAL_MODE', 'WAL'),
+    'synchronous': os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL'),
+    'cache_size': -int(os.getenv('SQLITE_CACHE_KB', 64000)),
+    'mmap_size': int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)),
+    'temp_store': 'MEMORY',
+}
+
+
+# Password validation
+# https://docs.djangoproject.com/en/2.2/ref/settings/#auth-password-validators
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
+    },
+]
+
+
+#  набор хешеров паролей выбирается переменной YATUBE_PASSWORD_HASHERS:
+#  'default' — PBKDF2, 'argon2' — Argon2 с параметрами ARGON2_*
+#  (нужен пакет argon2-cffi), 'fast' — MD5 только для тестов и замеров.
+#  Первый хешер в списке основной, остальные нужны для проверки
+#  старых хешей. ModelBackend пересчитывает устаревший хеш при входе
+#  в том же запросе, до записи хеша в сессию
+PASSWORD_HASHER_PROFILES = {
+    'default': [
+        'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+        'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+        'users.hashers.TunedArgon2PasswordHasher',
+    ],
+    'argon2': [
+        'users.hashers.TunedArgon2PasswordHasher',
+        'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+        'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    ],
+    'fast': [
+        'django.contrib.auth.hashers.MD5PasswordHasher',
+        'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    ],
+}
+
+TESTING = sys.argv[1:2] == ['test'] or 'pytest' in sys.modules
+
+PASSWORD_HASHER_PROFILE = os.getenv('YATUBE_PASSWORD_HASHERS',
+                                    'fast' if TESTING else 'default')
+
+ARGON2_TIME_COST = int(os.getenv('ARGON2_TIME_COST', 2))
+ARGON2_MEMORY_COST = int(os.getenv('ARGON2_MEMORY_COST', 19456))
+ARGON2_PARALLELISM = int(os.getenv('ARGON2_PARALLELISM', 1))
+
+
+# Internationalization
+# https://docs.djangoproject.com/en/2.2/topics/i18n/
+
+LANGUAGE_CODE = 'ru'
+
+TIME_ZONE = 'UTC'
+
+USE_I18N = True
+
+USE_L10N = True
+
+USE_TZ = True
+
+
+# Static files (CSS, JavaScript, Images)
+# https://docs.djangoproject.com/en/2.2/howto/static-files/
+
+MEDIA_URL = '/media/'
+MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+
+STATIC_URL = '/static/'
+
+STATIC_ROOT = os.getenv('STATIC_ROOT', os.path.join(BASE_DIR, 'static_root'))
+
+STATICFILES_DIRS = (os.path.join(BASE_DIR, 'static'),)
+
+#  сжатие ответов в core.middleware.CompressionMiddleware и сжатые копии
+#  статики в core.storage; brotli используется, если установлен пакет brotli
+COMPRESSION_MIN_LENGTH = 200
+
+COMPRESSIBLE_TYPES = (
+    'text/html', 'text/plain', 'text/css', 'text/csv', 'text/xml',
+    'application/json', 'application/javascript', 'application/xml',
+    'image/svg+xml',
+)
+
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.svg', '.html', '.txt', '.json',
+                           '.xml', '.map')
+
+#  уровни сжатия ответов: быстрые, так как сжатие идет на каждый запрос;
+#  статика сжимается один раз с максимальным уровнем
+GZIP_LEVEL = 6
+
+BROTLI_QUALITY = 5
+
+LOGIN_URL = 'users:login'
+
+LOGIN_REDIRECT_URL = 'posts:index'
+
+#  подключаем движок filebased.EmailBackend
+EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+
+# указываем директорию, в которую будут складываться файлы писем
+EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
+
+DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL', 'noreply@yatube.ru')
+
+#  адрес сайта для ссылок в письмах
+SITE_URL = os.getenv('SITE_URL', 'http://localhost:8000')
+
+#  дайджесты новых постов (команда send_digests): сколько секунд копятся
+#  уведомления получателя, сколько писем отправляется через одно
+#  SMTP-соединение, по сколько подписок читается при создании уведомлений
+NOTIFICATION_WINDOW = 3600
+
+NOTIFICATION_BATCH_SIZE = 100
+
+NOTIFICATION_CHUNK_SIZE = 1000
+
+#  просмотры постов копятся в памяти процесса и пишутся в БД одним
+#  запросом раз в VIEW_FLUSH_SECONDS или после VIEW_FLUSH_SIZE просмотров;
+#  None выключает сброс по времени
+VIEW_FLUSH_SECONDS = 10
+
+VIEW_FLUSH_SIZE = 1000
+
+#  рейтинг популярных постов (команда compute_trending): за сколько дней
+#  берутся посты и события, веса комментария, просмотра и нового
+#  подписчика автора, скорость «старения» и размер рейтинга
+TRENDING_WINDOW_DAYS = 7
+
+TRENDING_COMMENT_WEIGHT = 3.0
+
+TRENDING_VIEW_WEIGHT = 0.1
+
+TRENDING_FOLLOWER_WEIGHT = 1.0
+
+TRENDING_GRAVITY = 1.5
+
+TRENDING_SIZE = 50
+
+#  снимки архивных страниц: каталог с HTML-файлами и возраст, после
+#  которого полная страница архива считается неизменной
+ARCHIVE_ROOT = os.path.join(BASE_DIR, 'archive')
+
+ARCHIVE_AFTER_DAYS = 30
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+#  сколько секунд обратный прокси хранит анонимные страницы (s-maxage)
+#  и сколько браузер использует их без проверки ETag (max-age)
+EDGE_CACHE_SECONDS = int(os.getenv('EDGE_CACHE_SECONDS', 60))
+
+EDGE_CACHE_BROWSER_SECONDS = 0
+
+#  core.cache.stale_while_revalidate: сколько секунд после срока отдается
+#  устаревшая страница, пока ее пересчитывает один запрос; сколько живет
+#  блокировка пересчета (с файловым кешем — в памяти каждого процесса,
+#  общую на узел дает только кеш с атомарным add); коэффициент
+#  досрочного истечения (больше — раньше пересчет)
+PAGE_CACHE_STALE_SECONDS = 60
+
+PAGE_CACHE_LOCK_SECONDS = 10
+
+PAGE_CACHE_BETA = 1.0
+
+#  сколько секунд хранятся первая страница и число постов группы;
+#  изменения постов сбрасывают их сразу, срок страхует от пропущенных
+#  сигналов, например после смены имени автора
+GROUP_CACHE_SECONDS = 300
+
+#  наибольшее число постов на странице JSON API (параметр limit)
+API_MAX_LIMIT = 100
+
+#  брокер фоновых задач: ImmediateBroker выполняет их сразу в запросе,
+#  DatabaseBroker кладет в таблицу для команды run_tasks
+TASK_BROKER = os.getenv('TASK_BROKER', 'tasks.brokers.ImmediateBroker')
+
+#  сколько раз повторять упавшую задачу и базовая задержка повтора,
+#  которая удваивается с каждой попыткой
+TASK_MAX_ATTEMPTS = 5
+
+TASK_RETRY_DELAY = 10
+
+#  через сколько секунд задачу, взятую упавшим воркером, забирает другой
+TASK_LEASE_SECONDS = 300
+
+#  хранилище сессий выбирается переменной окружения YATUBE_SESSION_STORAGE:
+#  'signed_cookies' — без обращений к серверу, 'cache' — общий кеш,
+#  'cached_db' — кеш с записью в БД, 'db' — только таблица django_session
+SESSION_ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'cache': 'django.contrib.sessions.backends.cache',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}
+SESSION_STORAGE = os.getenv('YATUBE_SESSION_STORAGE', 'cached_db')
+
+#  режим ленты подписок: 'pull' — join по Follow при каждом запросе,
+#  'hybrid' — посты обычных авторов раскладываются по лентам при публикации,
+#  посты авторов с большим числом подписчиков подтягиваются при чтении
+FEED_MODE = 'hybrid'
+
+#  число подписчиков, начиная с которого автор считается «знаменитостью»
+FEED_CELEBRITY_THRESHOLD = 1000
+
+#  по сколько постов автора добавляется в ленты за один INSERT
+#  при подписке и после импорта
+FEED_BACKFILL_SIZE = 100
+
+#  сколько авторов рекомендуется для подписки на странице ленты
+RECOMMENDATIONS_TOP_K = 5
+
+#  веса сигналов при расчете рекомендаций: подписки подписок
+#  и общие обсуждения в комментариях
+RECOMMENDATIONS_FOLLOW_WEIGHT = 1.0
+RECOMMENDATIONS_COMMENT_WEIGHT = 0.5
@@ -0,0 +1,16 @@
+"""Настройки для нагрузочных замеров.
+
+Совпадают с prod, чтобы цифры отражали реальное развертывание,
+но не требуют секретов и используют быстрый хешер паролей.
+"""
+
+import os
+
+os.environ.setdefault('SECRET_KEY', 'bench-secret-key')
+
+from .prod import *
+
+PASSWORD_HASHER_PROFILE = os.getenv('YATUBE_PASSWORD_HASHERS', 'fast')
+
+#  замеры идут без collectstatic, манифеста хешированной статики нет
+STATICFILES_STORAGE = 'django.contrib.staticfiles.storage.StaticFilesStorage'
@@ -0,0 +1,8 @@
+"""Настройки для разработки и тестов: DEBUG, SQLite, LocMemCache."""
+
+from .base import *
+from .base import env_bool
+
+DEBUG = env_bool('DEBUG', True)
+
+TEMPLATE_CACHE = env_bool('YATUBE_TEMPLATE_CACHE', not DEBUG)
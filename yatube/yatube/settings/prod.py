@@ -0,0 +1,58 @@
+"""Настройки для развертывания.
+
+DEBUG выключен, поэтому не пишется журнал SQL-запросов, а медиафайлы
+отдает веб-сервер, а не Django. Соединения с БД переиспользуются,
+шаблоны кешируются, кеш общий для всех воркеров узла.
+"""
+
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+from .base import *
+from .base import BASE_DIR, DATABASES, env_bool
+
+DEBUG = False
+
+SECRET_KEY = os.getenv('SECRET_KEY')
+if not SECRET_KEY:
+    raise ImproperlyConfigured('В профиле prod нужно задать SECRET_KEY.')
+
+#  постоянные соединения и для основной БД, и для реплик
+for database in DATABASES.values():
+    database['CONN_MAX_AGE'] = int(os.getenv('CONN_MAX_AGE', 600))
+
+TEMPLATE_CACHE = env_bool('YATUBE_TEMPLATE_CACHE', True)
+
+#  статика с хешами в именах и заранее сжатыми .gz/.br копиями,
+#  требует collectstatic при выкладке
+STATICFILES_STORAGE = 'core.storage.CompressedManifestStaticFilesStorage'
+
+#  memcached, если задан его адрес, иначе файловый кеш,
+#  общий для всех процессов на узле. Файловый кеш при переполнении
+#  удаляет треть файлов без разбора, поэтому лимит задан с запасом
+#  под страницы, а сессии в нем не хранятся
+if os.getenv('MEMCACHED_LOCATION'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.memcached.MemcachedCache',
+            'LOCATION': os.getenv('MEMCACHED_LOCATION'),
+        }
+    }
+    SESSION_STORAGE = os.getenv('YATUBE_SESSION_STORAGE', 'cache')
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.getenv('YATUBE_CACHE_DIR',
+                                  os.path.join(BASE_DIR, 'cache')),
+            'OPTIONS': {
+                'MAX_ENTRIES': int(os.getenv('YATUBE_CACHE_MAX_ENTRIES',
+                                             100000)),
+            },
+        }
+    }
+    SESSION_STORAGE = os.getenv('YATUBE_SESSION_STORAGE', 'cached_db')
+
+#  побочные эффекты записи выполняет отдельный процесс run_tasks
+TASK_BROKER = os.getenv('TASK_BROKER', 'tasks.brokers.DatabaseBroker')